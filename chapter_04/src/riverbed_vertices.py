@@ -2,6 +2,76 @@
 
 import bpy
 import random
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional, dig_riverbed() falls back to plain NumPy without it.
+    njit = None
+
+
+# Number of entries in the SMOOTH falloff lookup table.
+FALLOFF_LUT_SIZE = 1024
+
+
+def smooth_falloff_lut(size=FALLOFF_LUT_SIZE):
+    """
+    Tabulates Blender's SMOOTH proportional editing falloff, 3s^2 - 2s^3 with
+    s = 1 - d/r, indexed by the squared normalized distance (d/r)^2.
+    Indexing by the squared distance keeps sqrt out of the digging loop.
+    """
+    s = 1.0 - np.sqrt(np.linspace(0.0, 1.0, size + 1, dtype=np.float32))
+    return (3.0 - 2.0 * s) * s * s
+
+
+# Compiled pit kernels, keyed by (pit_radius, min_pit_depth, max_pit_depth).
+_pit_kernels = {}
+
+
+def make_pit_kernel(pit_radius, min_pit_depth, max_pit_depth):
+    """
+    Returns a Numba kernel specialized for one set of dig_riverbed() parameters.
+    The radius, the falloff table scale and the depth clamps are baked into the
+    closure as constants, so the compiled loop does no per-pit division.
+    Kernels are cached per parameter set for the lifetime of the process.
+    """
+    key = (pit_radius, min_pit_depth, max_pit_depth)
+    kernel = _pit_kernels.get(key)
+    if kernel is not None:
+        return kernel
+
+    radius_sq = pit_radius * pit_radius
+    lut_scale = FALLOFF_LUT_SIZE / radius_sq
+    z_lowest = -1.0 * max_pit_depth
+    z_highest = -1.0 * min_pit_depth
+
+    @njit(fastmath=True)
+    def kernel(coords, pit_indices, z_depths, falloff_lut):
+        for p in range(pit_indices.shape[0]):
+            center = pit_indices[p]
+            cx = coords[center, 0]
+            cy = coords[center, 1]
+            cz = coords[center, 2]
+
+            z_target = cz - z_depths[p]
+            if z_target < z_lowest:
+                z_target = z_lowest
+            elif z_target > z_highest:
+                z_target = z_highest
+            z_displace = z_target - cz
+
+            for v in range(coords.shape[0]):
+                dx = coords[v, 0] - cx
+                dy = coords[v, 1] - cy
+                dz = coords[v, 2] - cz
+                dist_sq = dx * dx + dy * dy + dz * dz
+                if dist_sq < radius_sq:
+                    coords[v, 2] += z_displace * falloff_lut[int(dist_sq * lut_scale)]
+
+    _pit_kernels[key] = kernel
+    return kernel
+
 
 class RiverTerrain:
     """
@@ -24,15 +94,18 @@ class RiverTerrain:
         self.riverbed_indices = []
         self.riverbank_indices = []
 
+        # Cached (V, 3) vertex coordinates, shared by the riverbed steps.
+        self._coords = None
+
     
     def create_terrain(self):
         """
         1. Creates a rectangular plane and subdivides it.
         """
         print("[INFO] Creating terrain...")
-        bpy.ops.object.select_all(action='SELECT')
-        if bpy.context.active_object:
-            bpy.ops.object.delete(use_global=False)
+        # Remove objects through the data API, which skips the operator's undo push.
+        for obj in list(bpy.data.objects):
+            bpy.data.objects.remove(obj, do_unlink=True)
 
         bpy.ops.mesh.primitive_plane_add(
             size=1,
@@ -48,9 +121,23 @@ class RiverTerrain:
         bpy.ops.object.mode_set(mode='EDIT')
         bpy.ops.mesh.subdivide(number_cuts=self.subdivisions)
         bpy.ops.object.mode_set(mode='OBJECT')
+        self._coords = None
         print("[INFO] Terrain created.")   
  
 
+    def _get_coords(self):
+        """
+        Returns the cached (V, 3) vertex coordinates of the plane,
+        reading them with a single foreach_get on first use.
+        """
+        if self._coords is None:
+            vertices = self.plane.data.vertices
+            coords = np.empty(len(vertices) * 3, dtype=np.float32)
+            vertices.foreach_get("co", coords)
+            self._coords = coords.reshape(-1, 3)
+        return self._coords
+
+
     def select_riverbed_vertices(self):
         """
         2. Identifies vertices for the riverbed based on a random path.
@@ -64,19 +151,27 @@ class RiverTerrain:
         max_y = self.plane_length / 4
         river_widths = []
         for y_coord in range(int(min_y) * 10, int(max_y) * 10 + 1):
-            sub_y_coord = y_coord / 10.0
             random_x_left = random.uniform(-1.5, -0.5)
             random_x_right = random.uniform(0.5, 2.0)
-            river_widths.append((random_x_left, random_x_right, float(sub_y_coord)))
-
-        for vert in self.plane.data.vertices:
-            closest_point = min(river_widths, key=lambda p: abs(p[2] - vert.co.y))
-            riverbed_left = closest_point[0]
-            riverbed_right = closest_point[1]
-            if riverbed_left < vert.co.x < riverbed_right:
-                self.riverbed_indices.append(vert.index)
+            river_widths.append((random_x_left, random_x_right, y_coord / 10.0))
+
+        coords = self._get_coords()
+        for vert_index, (vert_x, vert_y, _) in enumerate(coords.tolist()):
+            # Explicit nearest-row search; avoids building a key lambda per vertex.
+            best_distance = 1e18
+            riverbed_left = riverbed_right = 0.0
+            for left, right, row_y in river_widths:
+                distance = row_y - vert_y
+                if distance < 0:
+                    distance = -distance
+                if distance < best_distance:
+                    best_distance = distance
+                    riverbed_left = left
+                    riverbed_right = right
+            if riverbed_left < vert_x < riverbed_right:
+                self.riverbed_indices.append(vert_index)
             else:
-                self.riverbank_indices.append(vert.index)
+                self.riverbank_indices.append(vert_index)
 
         if not self.riverbank_indices:
             print("No vertices found for the riverbed. Aborting.")
@@ -86,7 +181,8 @@ class RiverTerrain:
     def dig_riverbed(self, min_pit_depth=0.5, max_pit_depth=2.5, pit_radius=1.8):
         """
         3. Digs pits for each vertex in the riverbed_indices list
-           using iterative proportional editing.
+           using iterative proportional editing, evaluated with NumPy
+           on the vertex coordinates instead of bpy.ops.transform.translate.
 
         Args:
             min_pit_depth (float): The minimum depth for each pit.
@@ -98,43 +194,49 @@ class RiverTerrain:
             return
 
         print("[INFO] Digging riverbed pits... (This may take a moment)")
-        bpy.context.view_layer.objects.active = self.plane
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.context.tool_settings.mesh_select_mode = (True, False, False)
-
-        original_falloff = bpy.context.scene.tool_settings.proportional_edit_falloff
-        bpy.context.scene.tool_settings.proportional_edit_falloff = 'SMOOTH'
-
-        for i, vert_index in enumerate(self.riverbed_indices):
-            if i % 100 == 0:
-                print(f"  Digging pit {i} of {len(self.riverbed_indices)}...")
-
-            bpy.ops.mesh.select_all(action='DESELECT')
-            bpy.ops.object.mode_set(mode='OBJECT')
-            self.plane.data.vertices[vert_index].select = True
-            bpy.ops.object.mode_set(mode='EDIT')
-
-            # Apply a small, random downward translation with proportional editing
-            z_depth = -1.0 * random.uniform(min_pit_depth, max_pit_depth)
-            z_target = self.plane.data.vertices[vert_index].co.z - z_depth
-
-            if (z_target < -1.0 * max_pit_depth):
-                z_target = -1.0 * max_pit_depth
-            elif (z_target > -1.0 * min_pit_depth):
-                z_target = -1.0 * min_pit_depth
-
-            z_displace = z_target - self.plane.data.vertices[vert_index].co.z
-            bpy.ops.transform.translate(
-                value=(0, 0, z_displace),
-                orient_type='GLOBAL',
-                use_proportional_edit=True, 
-                proportional_edit_falloff='SMOOTH',  # Use linear for more uniform effect
-                proportional_size=pit_radius,
-                release_confirm=True
+        coords = self._get_coords()
+
+        # The SMOOTH falloff only depends on the distance, so build its table once per call.
+        falloff_lut = smooth_falloff_lut()
+        radius_sq = pit_radius * pit_radius
+        lut_scale = FALLOFF_LUT_SIZE / radius_sq
+
+        if njit is not None:
+            # Draw the depths up front, then run all pits in one compiled call.
+            z_depths = np.array(
+                [-1.0 * random.uniform(min_pit_depth, max_pit_depth) for _ in self.riverbed_indices],
+                dtype=np.float32
             )
-        
-        bpy.context.scene.tool_settings.proportional_edit_falloff = original_falloff
-        bpy.ops.object.mode_set(mode='OBJECT')
+            pit_indices = np.array(self.riverbed_indices, dtype=np.int64)
+            kernel = make_pit_kernel(pit_radius, min_pit_depth, max_pit_depth)
+            kernel(coords, pit_indices, z_depths, falloff_lut)
+        else:
+            for i, vert_index in enumerate(self.riverbed_indices):
+                if i % 100 == 0:
+                    print(f"  Digging pit {i} of {len(self.riverbed_indices)}...")
+
+                center = coords[vert_index].copy()
+
+                # Apply a small, random downward translation with proportional editing
+                z_depth = -1.0 * random.uniform(min_pit_depth, max_pit_depth)
+                z_target = center[2] - z_depth
+
+                if (z_target < -1.0 * max_pit_depth):
+                    z_target = -1.0 * max_pit_depth
+                elif (z_target > -1.0 * min_pit_depth):
+                    z_target = -1.0 * min_pit_depth
+
+                z_displace = z_target - center[2]
+
+                # Squared distances index the falloff table directly, no sqrt needed.
+                dist_sq = ((coords - center) ** 2).sum(axis=1)
+                nearby = np.flatnonzero(dist_sq < radius_sq)
+                lut_index = (dist_sq[nearby] * lut_scale).astype(np.int32)
+                coords[nearby, 2] += z_displace * falloff_lut[lut_index]
+
+        # The cache stays valid, it holds exactly what is written back.
+        self.plane.data.vertices.foreach_set("co", coords.ravel())
+        self.plane.data.update()
         print("[INFO] Finished digging riverbed.")
 
 
@@ -192,6 +294,8 @@ class RiverTerrain:
         
         bpy.context.scene.tool_settings.proportional_edit_falloff = original_falloff
         bpy.ops.object.mode_set(mode='OBJECT')
+        # The operators above moved the vertices, so the cached coordinates are stale.
+        self._coords = None
         print("[INFO] Finished raising riverbank.")
 
 
@@ -209,11 +313,15 @@ class RiverTerrain:
             return
             
         print("[INFO] Applying displacement texture...")
-        bpy.context.view_layer.objects.active = self.plane
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.uv.smart_project()
-        bpy.ops.object.mode_set(mode='OBJECT')
+        # Smart UV Project is expensive, run it only once per mesh.
+        if not self.plane.data.get("_uv_projected"):
+            bpy.context.view_layer.objects.active = self.plane
+            if self.plane.mode != 'EDIT':
+                bpy.ops.object.mode_set(mode='EDIT')
+            bpy.ops.mesh.select_all(action='SELECT')
+            bpy.ops.uv.smart_project()
+            bpy.ops.object.mode_set(mode='OBJECT')
+            self.plane.data["_uv_projected"] = True
 
         try:
             disp_image = bpy.data.images.load(texture_path, check_existing=True)
@@ -3,6 +3,14 @@ import os
 import sys
 import pprint
 
+try:
+    from shader_modifier.shader_generator import ShaderGenerator
+    from shader_modifier.modifier_generator import ModifierGenerator
+except ImportError as e:
+    print(f"[ERROR] Could not import ShaderGenerator or ModifierGenerator. Exception: '{str(e)}'")
+    ShaderGenerator = None
+    ModifierGenerator = None
+
 
 class ApplyTexture:
     """
@@ -12,18 +20,9 @@ class ApplyTexture:
         """
         Initializes the texture application process.
         """
-        self.texture_generator = None
-        self.modifier_generator = None
-
-        try:
-            from shader_modifier.shader_generator import ShaderGenerator
-            self.texture_generator = ShaderGenerator()
-
-            from shader_modifier.modifier_generator import ModifierGenerator
-            self.modifier_generator = ModifierGenerator()
-        except ImportError:
-            print("[ERROR] Could not import ApplyTexture class. Make sure 'apply_texture_to_mesh.py' is in the correct directory.")
-            ApplyTexture = None
+        # The generator classes are imported once at module level.
+        self.texture_generator = ShaderGenerator() if ShaderGenerator else None
+        self.modifier_generator = ModifierGenerator() if ModifierGenerator else None
 
         self.mesh = None
         self.texture_dir = None
@@ -277,12 +276,15 @@ class ApplyTexture:
         Usually, only one way is selected to use. 
         However, it is okay to use both. The rendering effect will look like doubly displaced. 
         """
-        # Prepare the mesh for UV mapping
-        bpy.context.view_layer.objects.active = self.mesh
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.uv.smart_project()
-        bpy.ops.object.mode_set(mode='OBJECT')
+        # Prepare the mesh for UV mapping, only once per mesh.
+        if not self.mesh.data.get("_uv_projected"):
+            bpy.context.view_layer.objects.active = self.mesh
+            if self.mesh.mode != 'EDIT':
+                bpy.ops.object.mode_set(mode='EDIT')
+            bpy.ops.mesh.select_all(action='SELECT')
+            bpy.ops.uv.smart_project()
+            bpy.ops.object.mode_set(mode='OBJECT')
+            self.mesh.data["_uv_projected"] = True
 
         try:
             # Load the displacement texture
@@ -359,8 +361,8 @@ class ApplyTexture:
     @staticmethod
     def run_demo():
         # Clear the scene and create a sample mesh to texture
-        bpy.ops.object.select_all(action='SELECT')
-        if bpy.context.active_object: bpy.ops.object.delete()
+        for obj in list(bpy.data.objects):
+            bpy.data.objects.remove(obj, do_unlink=True)
 
         bpy.ops.mesh.primitive_plane_add(size=10, location=(0, 0, 0))
         sample_mesh = bpy.context.active_object
@@ -369,6 +371,7 @@ class ApplyTexture:
         bpy.ops.mesh.subdivide(number_cuts=50)
         bpy.ops.uv.smart_project()
         bpy.ops.object.mode_set(mode='OBJECT')
+        sample_mesh.data["_uv_projected"] = True
 
         # Define the texture directory
         # IMPORTANT: Update this path to your texture folder
@@ -1,11 +1,55 @@
 import bpy
-import bmesh
 import os
 from math import atan2, pi, acos, sin, cos, asin
 import numpy as np
-import random
 from typing import Union
 
+try:
+    from numba import njit, prange
+except ImportError:
+    # Numba is optional, find_brightest_point_in_hdri() uses plain NumPy without it.
+    njit = None
+
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _brightest_window(summed_area, box_height, box_width):
+        """
+        Finds the largest 4x4 window sum in a zero-padded summed-area table without
+        materializing the full table of window sums. Rows are scanned in parallel; the
+        per-row results are then reduced in order, so ties resolve to the first window
+        in row-major order, as np.argmax does.
+        """
+        row_best = np.empty(box_height, dtype=np.float64)
+        row_best_u = np.empty(box_height, dtype=np.int64)
+        for v in prange(box_height):
+            best = -np.inf
+            best_u = 0
+            for u in range(box_width):
+                window = (summed_area[v + 4, u + 4] - summed_area[v, u + 4]
+                          - summed_area[v + 4, u] + summed_area[v, u])
+                if window > best:
+                    best = window
+                    best_u = u
+            row_best[v] = best
+            row_best_u[v] = best_u
+
+        best_v = 0
+        for v in range(1, box_height):
+            if row_best[v] > row_best[best_v]:
+                best_v = v
+        return best_v, row_best_u[best_v], row_best[best_v]
+
+
+def smooth_falloff(normalized_distance):
+    """
+    Blender's SMOOTH proportional editing falloff, 3s^2 - 2s^3 with s = 1 - d/r,
+    for distances already divided by the proportional size.
+    """
+    s = 1.0 - normalized_distance
+    return s * s * (3.0 - 2.0 * s)
+
+
 class DomeHdriGenerator:
     """
     A class to create a dome mesh object with HDRI texture applied directly to the mesh.
@@ -19,21 +63,36 @@ class DomeHdriGenerator:
     6. Place sunlight at that position
     """
     
-    def __init__(self, radius=100, hdri_path=None):
+    def __init__(self, radius=100, hdri_path=None, viewport_subdiv=2, render_subdiv=2, segments=64, ring_count=32):
         """
         Initialize the dome creation parameters.
         
         Args:
             radius (float): Radius of the dome in meters (default: 100)
             hdri_path (str): Path to HDRI texture file
+            viewport_subdiv (int): Subdivision Surface level in the viewport (default: 2)
+            render_subdiv (int): Subdivision Surface level at render time (default: 2)
+            segments (int): Number of UV sphere segments (default: 64)
+            ring_count (int): Number of UV sphere rings (default: 32)
+
+        The texture mapping quality comes from the mapping node and the HDRI resolution,
+        not from the base mesh, and the Subdivision Surface modifier smooths the final
+        shape; a coarser base sphere just makes every per-vertex pass cheaper.
         """
         self.radius = radius
+        self.viewport_subdiv = viewport_subdiv
+        self.render_subdiv = render_subdiv
+        self.segments = segments
+        self.ring_count = ring_count
         self.dome_object = None
-        self.floor_vertex_indices = []
+        # Indices of the flattened floor vertices, as an int32 array for direct indexing.
+        self.floor_vertex_indices = np.empty(0, dtype=np.int32)
 
         self.hdri_path = hdri_path
         self.hdri_image = None
         self.emission = None
+        # cos(latitude) per HDRI row, as an (H, 1) column; rebuilt when the height changes.
+        self._solid_angle_weights = None
     
 
     def create_sphere(self):
@@ -42,8 +101,8 @@ class DomeHdriGenerator:
         # Create a UV sphere at origin with specified radius
         bpy.ops.mesh.primitive_uv_sphere_add(
             radius=self.radius,
-            segments=128,  # Higher resolution for better texture mapping
-            ring_count=64,
+            segments=self.segments,
+            ring_count=self.ring_count,
             location=(0, 0, 0)
         )
         
@@ -52,6 +111,17 @@ class DomeHdriGenerator:
         self.dome_object.name = "DomeWithHdri"
 
     
+    @staticmethod
+    def _read_vertex_coords(vertices):
+        """
+        Returns the coordinates of a mesh's vertices as a (V, 3) float32 array.
+        """
+        vertex_count = len(vertices)
+        coords = np.empty(vertex_count * 3, dtype=np.float32)
+        vertices.foreach_get('co', coords)
+        return coords.reshape((vertex_count, 3))
+
+
     def flatten_lower_vertices(self):
         print(f"[INFO] DomeHdriGenerator::flatten_lower_vertices(),")
         print(f"       Select all vertices with Z < (radius/10) and flatten them by setting Z=0, ")
@@ -60,40 +130,45 @@ class DomeHdriGenerator:
         if not self.dome_object:
             raise RuntimeError("No dome object created. Call create_sphere() first.")
         
-        self.floor_vertex_indices = []
-
         # Calculate the Z threshold (1/10 of radius)
         z_threshold = -1.0 * self.radius / 10
         
-        # Enter edit mode
-        bpy.context.view_layer.objects.active = self.dome_object
-        bpy.ops.object.mode_set(mode='EDIT')
-        
-        # Get the bmesh representation
-        bm = bmesh.from_edit_mesh(self.dome_object.data)
-        bm.verts.ensure_lookup_table()
-        
-        # Process vertices with Z < threshold
-        flattened_count = 0
-        for vert in bm.verts:
-            # Flatten vertices by setting Z-coordinate to 0
-            # while preserving X and Y coordinates
-            if vert.co.z <= z_threshold:
-                vert.co.z = z_threshold
-                self.floor_vertex_indices.append(vert.index) # Store index instead of BMVert
-                flattened_count += 1
-        
+        # Work on the object-mode mesh directly; no Edit Mode round trip is needed
+        # for a coordinate-only change.
+        vertices = self.dome_object.data.vertices
+        coords = self._read_vertex_coords(vertices)
+
+        # Flatten vertices by clamping their Z-coordinate to the threshold
+        # while preserving X and Y coordinates
+        floor_mask = coords[:, 2] <= z_threshold
+        coords[floor_mask, 2] = z_threshold
+        self.floor_vertex_indices = np.flatnonzero(floor_mask).astype(np.int32)
+        flattened_count = len(self.floor_vertex_indices)
+
         # Update the mesh
-        bmesh.update_edit_mesh(self.dome_object.data)
-        
-        # Return to object mode
-        bpy.ops.object.mode_set(mode='OBJECT')
+        vertices.foreach_set('co', coords.ravel())
+        self.dome_object.data.update()
         
         print(f"Flattened {flattened_count} vertices with Z < {z_threshold}")
     
     
-    def punch(self, target_obj, target_vertex_idx, target_location: Union[float, tuple], radius):
-        # --- Perform all operations in a single Edit Mode session for efficiency ---
+    def _begin_punch_session(self, target_obj, target_vertex_idx):
+        """
+        Selects only the target vertex, enters Edit Mode on the target object with the
+        proportional editing settings used by punch(), and returns the previous falloff
+        so _end_punch_session() can restore it.
+        """
+        # Set the selection on the object-mode mesh; Edit Mode picks it up on entry, so
+        # no bmesh or vertex lookup table is needed to reach the target vertex.
+        if target_obj.mode == 'EDIT':
+            bpy.context.view_layer.objects.active = target_obj
+            bpy.ops.object.mode_set(mode='OBJECT')
+        mesh = target_obj.data
+        mesh.vertices.foreach_set('select', np.zeros(len(mesh.vertices), dtype=bool))
+        mesh.edges.foreach_set('select', np.zeros(len(mesh.edges), dtype=bool))
+        mesh.polygons.foreach_set('select', np.zeros(len(mesh.polygons), dtype=bool))
+        mesh.vertices[target_vertex_idx].select = True
+
         bpy.context.view_layer.objects.active = target_obj
         bpy.ops.object.mode_set(mode='EDIT')
         
@@ -102,29 +177,21 @@ class DomeHdriGenerator:
         bpy.context.scene.tool_settings.proportional_edit_falloff = 'SMOOTH'
         bpy.context.tool_settings.mesh_select_mode = (True, False, False)
 
-        """
-        Applies a proportional editing translation to a specific vertex.
-        This function assumes it is called when the object is already in Edit Mode.
-        """
-        # Get the bmesh representation
-        bm = bmesh.from_edit_mesh(target_obj.data)
-        bm.verts.ensure_lookup_table()
+        return original_falloff
 
-        # Deselect all vertices first
-        for v in bm.verts:
-            v.select = False
-        
-        # Select the target vertex
-        try:
-            target_vertex = bm.verts[target_vertex_idx]
-            target_vertex.select = True
-        except IndexError:
-            print(f"[ERROR] Vertex index {target_vertex_idx} is out of range.")
-            return
 
-        # Ensure the selection is updated in the mesh data
-        bmesh.update_edit_mesh(target_obj.data)
+    def _end_punch_session(self, original_falloff):
+        # Restore original settings and exit Edit Mode
+        bpy.context.scene.tool_settings.proportional_edit_falloff = original_falloff
+        bpy.ops.object.mode_set(mode='OBJECT')
+
 
+    def _translate_selected(self, target_location: Union[float, tuple], radius):
+        """
+        Applies a proportional editing translation to the selected vertices.
+        This function assumes it is called inside a punch session, in Edit Mode with
+        the SMOOTH falloff already set on the scene, which the operator picks up.
+        """
         # Apply the translation with proportional editing
         target_tuple = (0, 0, 0)
         if isinstance(target_location, (int, float)):
@@ -136,58 +203,58 @@ class DomeHdriGenerator:
             value=target_tuple,
             orient_type='GLOBAL',
             use_proportional_edit=True, 
-            proportional_edit_falloff='SMOOTH',
             proportional_size=radius,
             release_confirm=True
         )        
 
-        # Restore original settings and exit Edit Mode
-        bpy.context.scene.tool_settings.proportional_edit_falloff = original_falloff
-        bpy.ops.object.mode_set(mode='OBJECT')
+
+    def punch(self, target_obj, target_vertex_idx, target_location: Union[float, tuple], radius):
+        """
+        Applies a proportional editing translation to a specific vertex, in its own
+        Edit Mode session. Use floor_punch() for several punches on the dome floor.
+        """
+        if not 0 <= target_vertex_idx < len(target_obj.data.vertices):
+            print(f"[ERROR] Vertex index {target_vertex_idx} is out of range.")
+            return
+
+        original_falloff = self._begin_punch_session(target_obj, target_vertex_idx)
+        self._translate_selected(target_location, radius)
+        self._end_punch_session(original_falloff)
 
     
-    def floor_punch(self, num_punches=5, punch_height=10, punch_radius=10):
+    def floor_punch(self, num_punches=5, punch_height=10, punch_radius=10, seed=None):
         """
         Applies several random "punches" (proportional edits) to the floor vertices.
+        Pass a seed to pick the same punch positions on every run.
         """
-        if not self.floor_vertex_indices:
+        if len(self.floor_vertex_indices) == 0:
             print("[WARN] No floor vertices to punch.")
             return
 
         print(f"[INFO] Applying {num_punches} random punches to the floor, with punch_height={punch_height}, punch_radius={punch_radius}...")
 
-        """
-        # --- Perform all operations in a single Edit Mode session for efficiency ---
-        bpy.context.view_layer.objects.active = self.dome_object
-        bpy.ops.object.mode_set(mode='EDIT')
-        
-        # Set up proportional editing settings
-        original_falloff = bpy.context.scene.tool_settings.proportional_edit_falloff
-        bpy.context.scene.tool_settings.proportional_edit_falloff = 'SMOOTH'
-        bpy.context.tool_settings.mesh_select_mode = (True, False, False)        
-        """
-
         # Randomly select some vertex indices to punch
         if len(self.floor_vertex_indices) < num_punches:
             print(f"[WARN] Not enough floor vertices for {num_punches} punches. Using {len(self.floor_vertex_indices)} instead.")
             selected_floor_indices = self.floor_vertex_indices
         else:
-            selected_floor_indices = random.sample(self.floor_vertex_indices, num_punches)
+            rng = np.random.default_rng(seed)
+            selected_floor_indices = rng.choice(self.floor_vertex_indices, num_punches, replace=False)
 
-        # Iterate through the selected indices and apply the punch
+        # Apply the punches directly to the vertex coordinates instead of running the
+        # proportional editing operator in Edit Mode once per punch.
+        vertices = self.dome_object.data.vertices
+        coords = self._read_vertex_coords(vertices)
+
+        # Punches run in order, each measured from where the earlier ones left the mesh,
+        # matching consecutive proportional-edit translations.
         for vert_idx in selected_floor_indices:
-            self.punch(
-                target_obj=self.dome_object, 
-                target_vertex_idx=vert_idx,
-                target_location=punch_height, 
-                radius=punch_radius
-            )
-        
-        """"
-        # Restore original settings and exit Edit Mode
-        bpy.context.scene.tool_settings.proportional_edit_falloff = original_falloff
-        bpy.ops.object.mode_set(mode='OBJECT')        
-        """
+            distances = np.linalg.norm(coords - coords[vert_idx], axis=1)
+            affected = distances < punch_radius
+            coords[affected, 2] += punch_height * smooth_falloff(distances[affected] / punch_radius)
+
+        vertices.foreach_set('co', coords.ravel())
+        self.dome_object.data.update()
 
 
     def set_floor_basin_height(self, rectangular_region=(-1.0, -1.0, 1.0, 1.0), height_to_change: float=0.0):
@@ -197,35 +264,29 @@ class DomeHdriGenerator:
         if not self.dome_object:
             raise RuntimeError("No dome object created. Call create_sphere() first.")
         
-        if not self.floor_vertex_indices:
+        if len(self.floor_vertex_indices) == 0:
             print("[WARN] No floor vertices to modify.")
             return
 
-        # Enter edit mode to safely modify mesh data
-        bpy.context.view_layer.objects.active = self.dome_object
-        bpy.ops.object.mode_set(mode='EDIT')
-        
-        # Get a fresh bmesh representation
-        bm = bmesh.from_edit_mesh(self.dome_object.data)
-        bm.verts.ensure_lookup_table()
+        vertices = self.dome_object.data.vertices
+        coords = self._read_vertex_coords(vertices)
 
         min_x, min_y, max_x, max_y = rectangular_region
-        modified_count = 0
 
-        # Iterate through the stored vertex indices
-        for vert_index in self.floor_vertex_indices:
-            vert = bm.verts[vert_index]
-            
-            # Check if the vertex is within the rectangular region
-            if min_x < vert.co.x < max_x and min_y < vert.co.y < max_y:
-                vert.co.z += height_to_change
-                modified_count += 1
+        # Check which stored floor vertices are within the rectangular region
+        floor_indices = self.floor_vertex_indices
+        floor_coords = coords[floor_indices]
+        in_region = (
+            (min_x < floor_coords[:, 0]) & (floor_coords[:, 0] < max_x) &
+            (min_y < floor_coords[:, 1]) & (floor_coords[:, 1] < max_y)
+        )
+        coords[floor_indices[in_region], 2] += height_to_change
+        modified_count = int(np.count_nonzero(in_region))
                 
         # Write the changes back to the mesh
-        bmesh.update_edit_mesh(self.dome_object.data)
+        vertices.foreach_set('co', coords.ravel())
+        self.dome_object.data.update()
         
-        # Return to object mode
-        bpy.ops.object.mode_set(mode='OBJECT')
         print(f"[INFO] Modified height for {modified_count} vertices within {rectangular_region}.")
 
 
@@ -257,12 +318,13 @@ class DomeHdriGenerator:
         
         # Add a subsurface modifier for smoother shading
         subsurf_mod = self.dome_object.modifiers.new(name="Subsurf", type='SUBSURF')
-        subsurf_mod.levels = 2
-        subsurf_mod.render_levels = 3
+        subsurf_mod.levels = self.viewport_subdiv
+        subsurf_mod.render_levels = self.render_subdiv
         
-        # Add smooth shading
-        bpy.context.view_layer.objects.active = self.dome_object
-        bpy.ops.object.shade_smooth()
+        # Add smooth shading by setting the face flags directly, without an operator call
+        polygons = self.dome_object.data.polygons
+        polygons.foreach_set('use_smooth', np.ones(len(polygons), dtype=bool))
+        self.dome_object.data.update()
 
     
     def apply_hdri_to_dome(self):
@@ -307,7 +369,8 @@ class DomeHdriGenerator:
         
         # Load HDRI if it exists
         if os.path.exists(self.hdri_path):
-            self.hdri_image = bpy.data.images.load(self.hdri_path)
+            # Reuse the image if this file is already loaded, e.g. when the demo is re-run.
+            self.hdri_image = bpy.data.images.load(self.hdri_path, check_existing=True)
             env_texture.image = self.hdri_image
             print(f"[INFO] Loaded HDRI: {self.hdri_path}")
         else:
@@ -362,9 +425,13 @@ class DomeHdriGenerator:
         self.emission.inputs['Strength'].default_value = brightness
 
 
-    def find_brightest_point_in_hdri(self):
-        print(f"[INFO] DomeHdriGenerator::find_brightest_point_in_hdri(), this will take several minutes to finish.")
-        print(f"       Enumerate all pixels in the HDRI image and find the brightest point based on 4x4 pixel neighborhoods.")
+    def find_brightest_point_in_hdri(self, weight_by_solid_angle=True, coarse_factor=None):
+        print(f"[INFO] DomeHdriGenerator::find_brightest_point_in_hdri(),")
+        print(f"       Find the brightest point in the HDRI image based on 4x4 pixel neighborhoods.")
+        print(f"       weight_by_solid_angle: scale each row by cos(latitude), since rows near the")
+        print(f"       poles of an equirectangular image cover a smaller part of the sky.")
+        print(f"       coarse_factor: if set, find the peak on a map downsampled by this factor first,")
+        print(f"       then refine it at full resolution around that spot.")
         print(f"       Return: tuple: (brightest_uv_coord, max_brightness_value) ")
 
         if not self.hdri_image:
@@ -378,46 +445,52 @@ class DomeHdriGenerator:
         if not self.hdri_image.pixels:
             self.hdri_image.reload()  # Ensure pixels are loaded
         
-        pixels = np.array(self.hdri_image.pixels[:])
+        # Read the pixels straight into a float32 buffer, without a Python list in between.
+        pixels = np.empty(hdri_width * hdri_height * 4, dtype=np.float32)
+        self.hdri_image.pixels.foreach_get(pixels)
         pixels = pixels.reshape((hdri_height, hdri_width, 4))  # Reshape to HxWx4
         
-        # Flip vertically since Blender uses bottom-left origin but we need top-left for calculations
-        pixels = np.flipud(pixels)
-        
-        max_brightness = -1
-        brightest_uv = (0, 0)
-        
-        # Process all pixels in the HDRI
-        for v in range(2, hdri_height - 2):  # Avoid edges for 4x4 neighborhood
-            for u in range(2, hdri_width - 2):
-                # Calculate brightness in a 4x4 neighborhood
-                brightness = 0
-                count = 0
-                
-                for du in range(-2, 2):
-                    for dv in range(-2, 2):
-                        nu = u + du
-                        nv = v + dv
-                        
-                        # Check bounds
-                        if 0 <= nu < hdri_width and 0 <= nv < hdri_height:
-                            # Sum RGB values
-                            brightness += pixels[nv, nu, 0] + pixels[nv, nu, 1] + pixels[nv, nu, 2]
-                            count += 1
-                
-                # Average brightness
-                if count > 0:
-                    brightness /= count
-                    
-                    # Update maximum if this is brighter
-                    if brightness > max_brightness:
-                        max_brightness = brightness
-                        # Convert pixel coordinates to UV coordinates (0-1 range)
-                        uv_u = u / (hdri_width - 1)
-                        uv_v = v / (hdri_height - 1)
-                        # uv_v = (v + self.radius / 10) / (hdri_height - 1)
-                        # uv_v = v / (hdri_height - 1) + self.radius / 10
-                        brightest_uv = (uv_u, uv_v)
+        # Flip vertically since Blender uses bottom-left origin but we need top-left for calculations.
+        # A reversed-stride view, so no pixel data is copied.
+        pixels = pixels[::-1]
+        
+        # Per-pixel RGB sum, then the 4x4 neighborhood sum for every pixel (v, u) with
+        # 2 <= v < height-2 and 2 <= u < width-2, covering rows v-2..v+1 and columns u-2..u+1.
+        # Blender already stores pixels as C floats, so everything stays float32. float16 is
+        # not an option: sun pixels in an EXR can exceed its 65504 maximum. The channels are
+        # added in place, which is much cheaper than a reduction over a length-3 axis.
+        brightness_map = np.add(pixels[..., 0], pixels[..., 1])
+        brightness_map += pixels[..., 2]
+        if weight_by_solid_angle:
+            if self._solid_angle_weights is None or len(self._solid_angle_weights) != hdri_height:
+                latitudes = np.linspace(pi / 2, -pi / 2, hdri_height, dtype=np.float32)
+                self._solid_angle_weights = np.cos(latitudes)[:, None]
+            brightness_map *= self._solid_angle_weights
+
+        # Optionally locate the peak on a downsampled map first, then search only the
+        # full-resolution neighborhood of that coarse cell.
+        row_offset, col_offset = 0, 0
+        search_map = brightness_map
+        if coarse_factor and hdri_height >= 8 * coarse_factor and hdri_width >= 8 * coarse_factor:
+            coarse_height, coarse_width = hdri_height // coarse_factor, hdri_width // coarse_factor
+            coarse_map = brightness_map[:coarse_height * coarse_factor, :coarse_width * coarse_factor]
+            coarse_map = coarse_map.reshape(coarse_height, coarse_factor, coarse_width, coarse_factor).mean(axis=(1, 3))
+            coarse_v, coarse_u = np.unravel_index(np.argmax(coarse_map), coarse_map.shape)
+            row_offset = max(0, (coarse_v - 2) * coarse_factor)
+            col_offset = max(0, (coarse_u - 2) * coarse_factor)
+            search_map = brightness_map[row_offset:(coarse_v + 3) * coarse_factor,
+                                        col_offset:(coarse_u + 3) * coarse_factor]
+
+        brightest_window = self._search_brightest_window(search_map)
+        if brightest_window is None:
+            print("[WARN] HDRI image is too small for a 4x4 neighborhood search")
+            return ((0.5, 0.5), 0)
+
+        v, u, max_window = brightest_window
+        v, u = v + row_offset, u + col_offset
+        max_brightness = float(max_window) / 16
+        # Convert pixel coordinates to UV coordinates (0-1 range)
+        brightest_uv = (u / (hdri_width - 1), v / (hdri_height - 1))
         
         if max_brightness > 0:
             print(f"[INFO] Found brightest point in HDRI at UV: {brightest_uv}, Brightness value: {max_brightness}")
@@ -428,6 +501,40 @@ class DomeHdriGenerator:
             return ((0.5, 0.5), 0)
     
 
+    @staticmethod
+    def _search_brightest_window(brightness_map):
+        """
+        Finds the brightest 4x4 neighborhood in a 2D brightness map. Windows are centered
+        on (v, u) with 2 <= v < height-2 and 2 <= u < width-2 and cover rows v-2..v+1 and
+        columns u-2..u+1.
+
+        Returns:
+            tuple: (v, u, window_sum), or None if the map is smaller than a window.
+        """
+        map_height, map_width = brightness_map.shape
+        box_height, box_width = map_height - 4, map_width - 4
+        if box_height <= 0 or box_width <= 0:
+            return None
+
+        # Summed-area table with a leading zero row and column, so every 4x4 sum is four
+        # reads. It is accumulated in float64: a float32 running total over a 4k HDRI loses
+        # too much precision for the differences between neighboring windows.
+        summed_area = np.zeros((map_height + 1, map_width + 1), dtype=np.float64)
+        np.cumsum(brightness_map, axis=0, out=summed_area[1:, 1:])
+        np.cumsum(summed_area[1:, 1:], axis=1, out=summed_area[1:, 1:])
+
+        if njit is not None:
+            box_v, box_u, max_window = _brightest_window(summed_area, box_height, box_width)
+        else:
+            upper, lower = summed_area[:box_height], summed_area[4:4 + box_height]
+            box_sum = lower[:, 4:4 + box_width] - upper[:, 4:4 + box_width] - lower[:, :box_width] + upper[:, :box_width]
+
+            # argmax returns the first maximum in row-major order, as the original scan did.
+            box_v, box_u = np.unravel_index(np.argmax(box_sum), box_sum.shape)
+            max_window = box_sum[box_v, box_u]
+        return int(box_v) + 2, int(box_u) + 2, max_window
+    
+
     def convert_hdri_uv_to_3d(self, uv_coord):
         print(f"[INFO] DomeHdriGenerator::convert_hdri_uv_to_3d(), Convert 2D UV coordinate in HDRI to 3D coordinate on the dome surface.")
         print(f"       - u (0-1) maps to longitude (0 to 2π)")
@@ -462,6 +569,27 @@ class DomeHdriGenerator:
         return (x, y, z)
     
 
+    def convert_hdri_uvs_to_3d(self, uv_coords):
+        """
+        Batched form of convert_hdri_uv_to_3d(), e.g. for placing several suns.
+
+        Args:
+            uv_coords: (N, 2) array-like of UV coordinates in range [0, 1].
+
+        Returns:
+            np.ndarray: (N, 3) array of points on the dome surface.
+        """
+        uv_coords = np.asarray(uv_coords, dtype=np.float64).reshape(-1, 2)
+        longitude = (0.5 - uv_coords[:, 0]) * 2 * np.pi
+        latitude = uv_coords[:, 1] * np.pi
+
+        x = self.radius * np.sin(latitude) * np.cos(longitude)
+        y = self.radius * np.sin(latitude) * np.sin(longitude)
+        # Keep every point on the upper half of the dome (z > 0)
+        z = np.abs(self.radius * np.cos(latitude) + self.radius / 10)
+        return np.stack([x, y, z], axis=1)
+    
+
     def add_sunlight_at_brightest_point(self, brightest_3d_point):
         print(f"[INFO] DomeHdriGenerator::add_sunlight_at_brightest_point(),  Add a sunlight at the brightest point on the dome.")
 
@@ -510,15 +638,20 @@ class DomeHdriGenerator:
         # Clear existing mesh objects
         bpy.ops.object.select_all(action='DESELECT')
         # Select only mesh objects
-        for obj in bpy.context.scene.objects:
-            if obj.type == 'MESH' or obj.type == 'LIGHT':
+        scene_objects = bpy.context.scene.objects
+        for obj in scene_objects:
+            if obj.type in {'MESH', 'LIGHT'}:
                 obj.select_set(True)
         # Delete selected objects
         if bpy.context.selected_objects:
             bpy.ops.object.delete()
     
 
-    def create(self, radius=100, hdri_path=None):
+    def create(self, radius=100, hdri_path=None, coarse_factor=None):
+        """
+        Executes the complete dome creation process. coarse_factor is passed on to
+        find_brightest_point_in_hdri(); the default searches the full-resolution map.
+        """
         print(f"[INFO] DomeHdriGenerator::create(), Execute the complete dome creation process.")
  
         self.radius = radius
@@ -540,7 +673,7 @@ class DomeHdriGenerator:
         self.apply_hdri_to_dome()
         
         # Find brightest point in HDRI
-        brightest_uv, brightness = self.find_brightest_point_in_hdri()
+        brightest_uv, brightness = self.find_brightest_point_in_hdri(coarse_factor=coarse_factor)
         
         # Convert brightest UV to 3D coordinates on dome
         brightest_3d = self.convert_hdri_uv_to_3d(brightest_uv)
@@ -3,10 +3,178 @@ import sys
 
 import bpy
 import bmesh
-import random
+import functools
+import collections
 import numpy as np
 
-# from model.utils.curve_generator import CurveGenerator
+from model.utils.waterline_lookup import closest_x_along_path
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # Numba is optional, the proportional offsets fall back to plain NumPy without it.
+    njit = None
+
+try:
+    from model.utils.curve_generator import CurveGenerator
+except ImportError as e:
+    # Imported once per process; RiverbedGenerator reports the missing class when created.
+    print(f"[ERROR] Could not import CurveGenerator class. Exception: '{str(e)}'")
+    print(f"[INFO] In riverbed_generator, sys.path: '{sys.path}'")
+    CurveGenerator = None
+
+
+def smooth_falloff(normalized_distance):
+    """
+    Blender's SMOOTH proportional editing falloff, 3s^2 - 2s^3 with s = 1 - d/r,
+    for distances already divided by the proportional size.
+    """
+    s = 1.0 - normalized_distance
+    return s * s * (3.0 - 2.0 * s)
+
+
+# Vertices binned into square XY cells: vertex_cells holds the cell of every vertex,
+# order lists the vertex indices sorted by cell and cell_starts[c]:cell_starts[c + 1]
+# is the slice of order that falls into cell c. Cells are numbered row by row.
+VertexGrid = collections.namedtuple(
+    "VertexGrid", ["vertex_cells", "order", "cell_starts", "columns", "rows", "cell_size"])
+
+
+def build_vertex_grid(x, y, cell_size):
+    """
+    Bins the vertices into a uniform grid of cell_size cells. With cell_size at least
+    the proportional radius, everything a seed can reach lies in its 3x3 neighbourhood.
+    """
+    x_min, y_min = float(x.min()), float(y.min())
+    columns = int((float(x.max()) - x_min) // cell_size) + 1
+    rows = int((float(y.max()) - y_min) // cell_size) + 1
+
+    cell_x = np.minimum(((x - x_min) // cell_size).astype(np.int32), columns - 1)
+    cell_y = np.minimum(((y - y_min) // cell_size).astype(np.int32), rows - 1)
+    vertex_cells = cell_y * columns + cell_x
+
+    order = np.argsort(vertex_cells, kind='stable').astype(np.int32)
+    cell_starts = np.searchsorted(vertex_cells[order], np.arange(columns * rows + 1)).astype(np.int32)
+    return VertexGrid(vertex_cells, order, cell_starts, columns, rows, cell_size)
+
+
+def batch_seeds_by_cell(grid, seed_indices):
+    """
+    Orders the seeds into batches whose proportional edits never touch the same vertex.
+    Seeds are grouped by grid cell and the cells are coloured by (column % 3, row % 3):
+    two different cells of one colour are at least two cells apart, so their 3x3
+    neighbourhoods are disjoint and all groups of one colour can run at the same time.
+
+    Returns the seed permutation, the start of every cell group in the permuted seeds
+    and the start of every colour in the list of groups.
+    """
+    seed_cells = grid.vertex_cells[seed_indices]
+    cell_y, cell_x = np.divmod(seed_cells, grid.columns)
+    colours = (cell_y % 3) * 3 + cell_x % 3
+
+    # lexsort is stable, so seeds that share a cell keep their original order
+    permutation = np.lexsort((seed_cells, colours)).astype(np.int32)
+    sorted_cells = seed_cells[permutation]
+
+    new_group = np.ones(len(sorted_cells), dtype=bool)
+    new_group[1:] = sorted_cells[1:] != sorted_cells[:-1]
+    group_starts = np.append(np.flatnonzero(new_group), len(sorted_cells)).astype(np.int32)
+
+    group_colours = colours[permutation][group_starts[:-1]]
+    colour_starts = np.searchsorted(group_colours, np.arange(10)).astype(np.int32)
+    return permutation, group_starts, colour_starts
+
+
+if njit is not None:
+    # Compiled eagerly for float32 coordinates and offsets, the precision Blender stores
+    # vertex positions in, so no float64 math sneaks into the loop.
+    @njit("f4[::1](f4[::1], f4[::1], i4[::1], f4[::1], f4, i4[::1], i4[::1], i4[::1], i4[::1], i4[::1], i8, i8)",
+          parallel=True, fastmath=True, cache=True)
+    def _scatter_proportional_offsets(x, y, seed_indices, offsets, radius, group_starts, colour_starts,
+                                      vertex_cells, order, cell_starts, columns, rows):
+        """
+        Adds the SMOOTH falloff weighted offset of every seed to the vertices in the
+        seed's 3x3 cell neighbourhood. The seeds come batched by batch_seeds_by_cell():
+        the cell groups of one colour are processed in parallel, since no two of them
+        reach the same vertex, and the nine colours run one after another.
+        """
+        one = np.float32(1.0)
+        two = np.float32(2.0)
+        three = np.float32(3.0)
+        radius_sq = radius * radius
+        dz = np.zeros(x.shape[0], dtype=np.float32)
+        for colour in range(9):
+            for group in prange(colour_starts[colour], colour_starts[colour + 1]):
+                for i in range(group_starts[group], group_starts[group + 1]):
+                    seed = seed_indices[i]
+                    seed_x = x[seed]
+                    seed_y = y[seed]
+                    cell_x = vertex_cells[seed] % columns
+                    cell_y = vertex_cells[seed] // columns
+                    first_x = max(cell_x - 1, 0)
+                    last_x = min(cell_x + 1, columns - 1)
+
+                    # The cells of one grid row are contiguous in order
+                    for row in range(max(cell_y - 1, 0), min(cell_y + 2, rows)):
+                        for k in range(cell_starts[row * columns + first_x],
+                                       cell_starts[row * columns + last_x + 1]):
+                            v = order[k]
+                            dx = x[v] - seed_x
+                            dy = y[v] - seed_y
+                            dist_sq = dx * dx + dy * dy
+                            if dist_sq < radius_sq:
+                                s = one - np.sqrt(dist_sq) / radius
+                                dz[v] += offsets[i] * s * s * (three - two * s)
+        return dz
+
+    @njit("f4[::1](f4[::1], f4[::1], f4[::1], i4[::1], f4, i4[::1], i4[::1], i4[::1], i8, i8)",
+          fastmath=True, cache=True)
+    def _sequential_offsets_to_zero(x, y, z, seed_indices, radius, vertex_cells, order, cell_starts, columns, rows):
+        """
+        Translates the seeds to Z=0 one after another with the SMOOTH falloff, each seed
+        moving by minus its current Z, which includes the edits of the seeds before it.
+        Runs serially, since every seed depends on the previous ones.
+        """
+        one = np.float32(1.0)
+        two = np.float32(2.0)
+        three = np.float32(3.0)
+        radius_sq = radius * radius
+        dz = np.zeros(x.shape[0], dtype=np.float32)
+        for i in range(seed_indices.shape[0]):
+            seed = seed_indices[i]
+            offset = -(z[seed] + dz[seed])
+            seed_x = x[seed]
+            seed_y = y[seed]
+            cell_x = vertex_cells[seed] % columns
+            cell_y = vertex_cells[seed] // columns
+            first_x = max(cell_x - 1, 0)
+            last_x = min(cell_x + 1, columns - 1)
+
+            for row in range(max(cell_y - 1, 0), min(cell_y + 2, rows)):
+                for k in range(cell_starts[row * columns + first_x],
+                               cell_starts[row * columns + last_x + 1]):
+                    v = order[k]
+                    dx = x[v] - seed_x
+                    dy = y[v] - seed_y
+                    dist_sq = dx * dx + dy * dy
+                    if dist_sq < radius_sq:
+                        s = one - np.sqrt(dist_sq) / radius
+                        dz[v] += offset * s * s * (three - two * s)
+        return dz
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_waterline(curve_generator_class, curve_seed, num_deviations, width, length, subdivisions):
+    """
+    Returns the Bezier waterline for one seed and curve setup as a read-only (N, 2) array.
+    The seed goes to the curve generator's own random generator, so seeding a waterline
+    does not make the rest of the script deterministic.
+    """
+    curve_generator = curve_generator_class(width=width, length=length, subdivisions=subdivisions,
+                                            seed=curve_seed)
+    curve = np.array(curve_generator.create_bezier_curve(num_deviations=num_deviations), dtype=float)
+    curve.flags.writeable = False
+    return curve
 
 
 class RiverbedGenerator:
@@ -24,255 +192,384 @@ class RiverbedGenerator:
         self.plane_subdivisions = (0, 0)
 
 
+        # Created by select_riverbed_vertices(), once the terrain dimensions are known
         self.curve_generator = None
         self.left_waterline = []
         self.right_waterline = []
 
-        self.riverbed_indices = []
-        self.riverbank_indices = []
+        self.riverbed_indices = np.empty(0, dtype=np.int32)
+        self.riverbank_indices = np.empty(0, dtype=np.int32)
         self.riverbed_depth = 0.0
-
-        try:
-            print(f"[INFO] In RiverbedGenerator, sys.path: '{sys.path}'")
-            from model.utils.curve_generator import CurveGenerator
-            self.curve_generator = CurveGenerator(width=10, length=20, subdivisions=(8, 18))
-        except ImportError as e:
-            print(f"[ERROR] Could not import CurveGenerator class. Exception: '{str(e)}'")
-            self.curve_generator = None        
+        self.riverbed_deepest_index = -1
         
     
     def create_terrain(self, plane_width=10, plane_length=20, subdivisions=(8, 18)):
+        """
+        Builds the terrain grid directly as mesh data, with the same layout as
+        primitive_grid_add followed by applying the scale: subdivisions[0] x subdivisions[1]
+        quads spanning plane_width x plane_length, centered at the origin, with a UV map.
+        """
         print("[INFO] Creating terrain...")
         self.plane_width = plane_width
         self.plane_length = plane_length
         self.plane_subdivisions = subdivisions
 
-        bpy.ops.mesh.primitive_grid_add(
-            x_subdivisions=self.plane_subdivisions[0],
-            y_subdivisions=self.plane_subdivisions[1], 
-            size=1.0, 
-            align='WORLD', 
-            location=(0, 0, 0)
-        )
+        columns = self.plane_subdivisions[0] + 1
+        rows = self.plane_subdivisions[1] + 1
+        u, v = np.meshgrid(np.linspace(0.0, 1.0, columns), np.linspace(0.0, 1.0, rows))
+        u = u.ravel()
+        v = v.ravel()
+        vertices = np.stack([(u - 0.5) * self.plane_width,
+                             (v - 0.5) * self.plane_length,
+                             np.zeros_like(u)], axis=-1)
+
+        # One counter-clockwise quad per grid cell
+        i, j = np.meshgrid(np.arange(columns - 1), np.arange(rows - 1))
+        corner = (j * columns + i).ravel()
+        faces = np.stack([corner, corner + 1, corner + columns + 1, corner + columns], axis=-1)
+
+        mesh = bpy.data.meshes.new("RiverTerrain")
+        mesh.from_pydata(vertices.tolist(), [], faces.tolist())
+
+        uv_layer = mesh.uv_layers.new(name="UVMap")
+        loop_vertex_indices = faces.ravel()
+        uvs = np.stack([u[loop_vertex_indices], v[loop_vertex_indices]], axis=-1)
+        uv_layer.data.foreach_set("uv", uvs.astype(np.float32).ravel())
+        mesh.update()
+
+        self.plane = bpy.data.objects.new("RiverTerrain", mesh)
+        bpy.context.collection.objects.link(self.plane)
+        bpy.context.view_layer.objects.active = self.plane
+        self.plane.select_set(True)
 
-        self.plane = bpy.context.active_object
-        self.plane.name = "RiverTerrain"
-        
-        # Scale the river plane to the desired dimensions
-        self.plane.scale = (self.plane_width, self.plane_length, 1.0)
-        bpy.ops.object.transform_apply(location=False, rotation=False, scale=True)
 
+    def _create_waterline(self, num_deviations, curve_seed=None):
+        """
+        Returns a Bezier waterline, freshly randomized, or from the waterline cache
+        when a curve_seed is given.
+        """
+        if curve_seed is None:
+            return self.curve_generator.create_bezier_curve(num_deviations=num_deviations)
 
-    def select_riverbed_vertices(self):
+        cg = self.curve_generator
+        return _cached_waterline(type(cg), curve_seed, num_deviations,
+                                 cg.width, cg.length, tuple(cg.subdivisions))
+
+
+    def select_riverbed_vertices(self, curve_seed=None):
         """
         Identifies vertices for the riverbed based on two smoothly interpolated waterlines.
+
+        Args:
+            curve_seed (int): Optional seed for the waterlines. Seeded waterlines are
+                              cached, so rebuilding the same riverbed skips the curve step.
         """
         if not self.plane:
             print("[ERROR] Terrain plane not found. Please run create_terrain() first.")
             return
 
         print("[INFO] Selecting riverbed vertices using smooth waterlines...")
-        if self.curve_generator is None:
-            print(f"[ERROR] self.curve_generator is None! ")
+        if CurveGenerator is None:
+            print("[ERROR] CurveGenerator is not available, the waterlines cannot be created.")
+            return
+
+        # Size the waterlines to the terrain, one curve point per row of vertices
+        curve_setup = (self.plane_width, self.plane_length, tuple(self.plane_subdivisions))
+        cg = self.curve_generator
+        if cg is None or (cg.width, cg.length, tuple(cg.subdivisions)) != curve_setup:
+            self.curve_generator = CurveGenerator(width=self.plane_width, length=self.plane_length,
+                                                  subdivisions=self.plane_subdivisions)
 
         # 1. Generate the left and right waterlines for the river's path
         # left_waterline, right_waterline = self.create_river_waterlines(num_left_deviations, num_right_deviations)
         
         
-        bezier_curve_left = self.curve_generator.create_bezier_curve(num_deviations=14)
-        self.left_waterline = [(x - 0.25 * self.plane_width, y) for x, y in bezier_curve_left]
-        bezier_curve_right = self.curve_generator.create_bezier_curve(num_deviations=28)
-        self.right_waterline = [(x + 0.25 * self.plane_width, y) for x, y in bezier_curve_right]          
+        right_seed = None if curve_seed is None else curve_seed + 1
+        # Shift whole curves at once, rather than rebuilding an (x, y) tuple per point
+        bank_offset = np.array([0.25 * self.plane_width, 0.0])
+        bezier_curve_left = self._create_waterline(num_deviations=14, curve_seed=curve_seed)
+        self.left_waterline = bezier_curve_left - bank_offset
+        bezier_curve_right = self._create_waterline(num_deviations=28, curve_seed=right_seed)
+        self.right_waterline = bezier_curve_right + bank_offset
         
-        left_path = np.array(self.left_waterline)
-        right_path = np.array(self.right_waterline)
+        left_path = self.left_waterline.astype(np.float32)
+        right_path = self.right_waterline.astype(np.float32)
 
         # 2. Select vertices based on their position between the two waterlines
-        vertices = self.plane.data.vertices
-        for vert in vertices:
-            vertex_co = np.array([vert.co.x, vert.co.y])
-            
-            # Find the segment on the river path that is closest to the vertex's y-coordinate
-            # for both left and right waterlines
-            left_distances_y = np.abs(left_path[:, 1] - vertex_co[1])
-            closest_left_index = np.argmin(left_distances_y)
-            riverbed_left_x = left_path[closest_left_index][0]
-
-            right_distances_y = np.abs(right_path[:, 1] - vertex_co[1])
-            closest_right_index = np.argmin(right_distances_y)
-            riverbed_right_x = right_path[closest_right_index][0]
-
-            # Check if the vertex's x-coordinate is within the riverbed boundaries
-            if riverbed_left_x < vert.co.x < riverbed_right_x:
-                self.riverbed_indices.append(vert.index)
-            else:
-                self.riverbank_indices.append(vert.index)
-
-
-        if not self.riverbed_indices:
+        coords = self._read_vertex_coords()
+
+        # Find the segment on the river path that is closest to each vertex's y-coordinate
+        # for both left and right waterlines, for all vertices at once
+        riverbed_left_x = closest_x_along_path(left_path, coords[:, 1])
+        riverbed_right_x = closest_x_along_path(right_path, coords[:, 1])
+
+        # Check if the vertex's x-coordinate is within the riverbed boundaries
+        in_riverbed = (riverbed_left_x < coords[:, 0]) & (coords[:, 0] < riverbed_right_x)
+        self.riverbed_indices = np.flatnonzero(in_riverbed).astype(np.int32)
+        self.riverbank_indices = np.flatnonzero(~in_riverbed).astype(np.int32)
+
+        if self.riverbed_indices.size == 0:
             print("[WARNING] No vertices were selected for the riverbed. The river may be too narrow or off the plane.")
             return
         
         print(f"[INFO] Selected {len(self.riverbed_indices)} vertices for the riverbed.")
   
 
+    def _read_vertex_coords(self):
+        """
+        Returns the plane's vertex coordinates as a (V, 3) float32 array.
+        """
+        vertices = self.plane.data.vertices
+        coords = np.empty(len(vertices) * 3, dtype=np.float32)
+        vertices.foreach_get("co", coords)
+        return coords.reshape(-1, 3)
+
+
+    @staticmethod
+    def _split_axes(coords):
+        """
+        Splits (V, 3) coordinates into contiguous x, y and z arrays, so the distance
+        loops stream over X and Y only instead of striding over interleaved XYZ.
+        """
+        return [np.ascontiguousarray(coords[:, axis]) for axis in range(3)]
+
+
+    def _write_vertex_coords(self, coords):
+        self.plane.data.vertices.foreach_set("co", coords.ravel())
+        self.plane.data.update()
+
+
+    @staticmethod
+    def _proportional_offsets(x, y, seed_indices, offsets, radius, grid=None):
+        """
+        Evaluates what proportional editing with the SMOOTH falloff would do
+        when each seed vertex is translated along Z by its offset, and returns
+        the summed Z displacement of every vertex.
+
+        Distances are measured in the XY plane of the coordinates passed in,
+        so the seeds do not depend on each other and can be summed in any order.
+        Only the vertices in the 3x3 grid cells around a seed are tested; a grid
+        built with cells smaller than the radius is replaced by a fitting one.
+        """
+        if grid is None or grid.cell_size < radius:
+            grid = build_vertex_grid(x, y, radius)
+
+        seed_indices = np.asarray(seed_indices, dtype=np.int32)
+        offsets = np.asarray(offsets, dtype=np.float32)
+        radius = np.float32(radius)
+
+        if njit is not None:
+            permutation, group_starts, colour_starts = batch_seeds_by_cell(grid, seed_indices)
+            return _scatter_proportional_offsets(x, y, seed_indices[permutation], offsets[permutation], radius,
+                                                 group_starts, colour_starts,
+                                                 grid.vertex_cells, grid.order, grid.cell_starts,
+                                                 grid.columns, grid.rows)
+
+        dz = np.zeros(len(x), dtype=np.float32)
+        for seed_index, offset in zip(seed_indices, offsets):
+            nearby, weights = RiverbedGenerator._falloff_weights(x, y, seed_index, radius, grid)
+            dz[nearby] += offset * weights
+        return dz
+
+
+    @staticmethod
+    def _falloff_weights(x, y, seed_index, radius, grid):
+        """
+        Returns the vertices within radius of a seed, found in the seed's 3x3 grid
+        cell neighbourhood, and their SMOOTH falloff weights.
+        """
+        cell_y, cell_x = divmod(int(grid.vertex_cells[seed_index]), grid.columns)
+        first_x = max(cell_x - 1, 0)
+        last_x = min(cell_x + 1, grid.columns - 1)
+        candidates = np.concatenate([
+            grid.order[grid.cell_starts[row * grid.columns + first_x]:
+                       grid.cell_starts[row * grid.columns + last_x + 1]]
+            for row in range(max(cell_y - 1, 0), min(cell_y + 2, grid.rows))
+        ])
+
+        dist_sq = (x[candidates] - x[seed_index]) ** 2 + (y[candidates] - y[seed_index]) ** 2
+        inside = dist_sq < radius * radius
+        return candidates[inside], smooth_falloff(np.sqrt(dist_sq[inside]) / radius)
+
+
+    @staticmethod
+    def _sequential_offsets_to_zero(x, y, z, seed_indices, radius, grid=None):
+        """
+        Evaluates what proportional editing with the SMOOTH falloff does when the seed
+        vertices are translated to Z=0 one after another, and returns the resulting Z
+        displacement of every vertex. Unlike _proportional_offsets(), every seed moves by
+        minus its current Z, after the edits of the seeds before it, so the order matters.
+        """
+        if grid is None or grid.cell_size < radius:
+            grid = build_vertex_grid(x, y, radius)
+
+        seed_indices = np.asarray(seed_indices, dtype=np.int32)
+        z = np.ascontiguousarray(z, dtype=np.float32)
+        radius = np.float32(radius)
+
+        if njit is not None:
+            return _sequential_offsets_to_zero(x, y, z, seed_indices, radius,
+                                               grid.vertex_cells, grid.order, grid.cell_starts,
+                                               grid.columns, grid.rows)
+
+        dz = np.zeros(len(x), dtype=np.float32)
+        for seed_index in seed_indices:
+            nearby, weights = RiverbedGenerator._falloff_weights(x, y, seed_index, radius, grid)
+            dz[nearby] -= (z[seed_index] + dz[seed_index]) * weights
+        return dz
+
+
+    def _dig_offsets(self, x, y, min_pit_depth, max_pit_depth, pit_radius, grid=None):
+        """
+        Returns the Z displacement of every vertex for one pit per riverbed vertex.
+        """
+        # Apply a small, random downward translation with proportional editing
+        z_depths = -np.random.uniform(min_pit_depth, max_pit_depth, len(self.riverbed_indices)).astype(np.float32)
+        return self._proportional_offsets(x, y, self.riverbed_indices, z_depths, pit_radius, grid)
+
+
+    def _raise_offsets(self, x, y, min_riverbank_height, max_riverbank_height, bump_radius, grid=None):
+        """
+        Returns the Z displacement of every vertex for one bump per riverbank vertex.
+        """
+        # Apply a small, random upward translation with proportional editing
+        z_heights = np.random.uniform(min_riverbank_height, max_riverbank_height,
+                                      len(self.riverbank_indices)).astype(np.float32)
+
+        # Make banks higher further from the river center. The factor is read from the
+        # bulk x array for all bumps at once, scaled by a reciprocal computed once.
+        z_heights *= np.abs(x[self.riverbank_indices]) * np.float32(2.0 / self.plane_width)
+        return self._proportional_offsets(x, y, self.riverbank_indices, z_heights, bump_radius, grid)
+
+
+    def _find_boundary_indices(self):
+        # Find all boundary vertices, which is a more reliable way to get the edges of a plane.
+        # A standalone bmesh reads the mesh data in Object Mode, no Edit Mode round trip needed.
+        bm = bmesh.new()
+        bm.from_mesh(self.plane.data)
+        boundary_indices = np.fromiter((v.index for v in bm.verts if v.is_boundary), dtype=np.int32)
+        bm.free()
+        return boundary_indices
+
+
+    def _align_offsets(self, x, y, z, boundary_indices, proportional_radius, grid=None):
+        """
+        Returns the Z displacement that brings the boundary vertices to Z=0.
+        """
+        # Translate each boundary vertex to Z=0 with proportional editing, one after
+        # another as the operator loop did, each from the Z the previous ones left.
+        return self._sequential_offsets_to_zero(x, y, z, boundary_indices, proportional_radius, grid)
+
+
     def dig_riverbed(self, min_pit_depth=1.0, max_pit_depth=2.0, pit_radius=1.8):
         """
         3. Digs pits for each vertex in the riverbed_indices list
-           using iterative proportional editing.
+           by evaluating the proportional editing falloff on the vertex
+           coordinates, instead of one bpy.ops.transform.translate per pit.
 
         Args:
             min_pit_depth (float): The minimum depth for each pit.
             max_pit_depth (float): The maximum depth for each pit.
             pit_radius (float): The radius for each proportional editing operation.
         """
-        if not self.riverbed_indices:
+        if self.riverbed_indices.size == 0:
             print("[ERROR] No riverbed vertices selected. Please run select_riverbed_vertices() first.")
             return
 
-        print("[INFO] Digging riverbed pits... (This may take a moment)")
-        bpy.context.view_layer.objects.active = self.plane
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.context.tool_settings.mesh_select_mode = (True, False, False)
-
-        original_falloff = bpy.context.scene.tool_settings.proportional_edit_falloff
-        bpy.context.scene.tool_settings.proportional_edit_falloff = 'SMOOTH'
-
-        for i, vert_index in enumerate(self.riverbed_indices):
-            if i % 100 == 0:
-                print(f"  Digging pit {i} of {len(self.riverbed_indices)}...")
-
-            bpy.ops.mesh.select_all(action='DESELECT')
-            bpy.ops.object.mode_set(mode='OBJECT')
-            self.plane.data.vertices[vert_index].select = True
-            bpy.ops.object.mode_set(mode='EDIT')
-
-            # Apply a small, random downward translation with proportional editing
-            z_depth = -1.0 * random.uniform(min_pit_depth, max_pit_depth)
-            
-            bpy.ops.transform.translate(
-                value=(0, 0, z_depth),
-                orient_type='GLOBAL',
-                use_proportional_edit=True, 
-                proportional_edit_falloff='SMOOTH',
-                proportional_size=pit_radius,
-                release_confirm=True
-            )
-        
-        bpy.context.scene.tool_settings.proportional_edit_falloff = original_falloff
-        bpy.ops.object.mode_set(mode='OBJECT')
+        print(f"[INFO] Digging {len(self.riverbed_indices)} riverbed pits...")
+        coords = self._read_vertex_coords()
+        x, y, z = self._split_axes(coords)
+        coords[:, 2] = z + self._dig_offsets(x, y, min_pit_depth, max_pit_depth, pit_radius)
+        self._write_vertex_coords(coords)
         print("[INFO] Finished digging riverbed.")
 
 
     def get_riverbed_depth(self):
+        """
+        Finds the lowest Z among the riverbed vertices, and the index of that vertex.
+        """
         self.riverbed_depth = sys.float_info.max
+        self.riverbed_deepest_index = -1
 
-        for vert_idx in self.riverbed_indices:
-            vertex = self.plane.data.vertices[vert_idx]
-            if vertex.co[2] < self.riverbed_depth:
-                self.riverbed_depth = vertex.co[2]
-        print(f"[INFO] The depth of the riverbed is {self.riverbed_depth}")
+        if self.riverbed_indices.size > 0:
+            riverbed_z = np.take(self._read_vertex_coords()[:, 2], self.riverbed_indices)
+            deepest = int(np.argmin(riverbed_z))
+            self.riverbed_depth = float(riverbed_z[deepest])
+            self.riverbed_deepest_index = int(self.riverbed_indices[deepest])
+        print(f"[INFO] The depth of the riverbed is {self.riverbed_depth}, at vertex {self.riverbed_deepest_index}")
 
 
     def raise_riverbank(self, min_riverbank_height=0.0, max_riverbank_height=1.5, bump_radius=1.8):
         """
         4. Raise riverbank for each vertex outside of the riverbed_indices list
-           using iterative proportional editing.
+           by evaluating the proportional editing falloff on the vertex coordinates.
 
         Args:
             min_riverbank_height (float): The minimum depth for each pit.
             max_riverbank_height (float): The maximum depth for each pit.
             riverbank_radius (float): The radius for each proportional editing operation.
         """
-        if not self.riverbank_indices:
+        if self.riverbank_indices.size == 0:
             print("[ERROR] No riverbank vertices selected. Please run select_riverbed_vertices() first.")
             return
 
-        print("[INFO] Raising riverbank ... (This may take a moment)")
-        bpy.context.view_layer.objects.active = self.plane
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.context.tool_settings.mesh_select_mode = (True, False, False)
-
-        original_falloff = bpy.context.scene.tool_settings.proportional_edit_falloff
-        bpy.context.scene.tool_settings.proportional_edit_falloff = 'SMOOTH'
-
-        for i, vert_index in enumerate(self.riverbank_indices):
-            if i % 100 == 0:
-                print(f"  Raising riverbank {i} of {len(self.riverbank_indices)}...")
-
-            bpy.ops.mesh.select_all(action='DESELECT')
-            bpy.ops.object.mode_set(mode='OBJECT')
-            self.plane.data.vertices[vert_index].select = True
-            bpy.ops.object.mode_set(mode='EDIT')
-
-            # Apply a small, random upward translation with proportional editing
-            z_height = random.uniform(min_riverbank_height, max_riverbank_height)
-            
-            # Make banks higher further from the river center
-            deviation_from_middle = abs(self.plane.data.vertices[vert_index].co.x) / (0.5 * self.plane_width) 
-            z_height *= deviation_from_middle
-
-            bpy.ops.transform.translate(
-                value=(0, 0, z_height),
-                orient_type='GLOBAL',
-                use_proportional_edit=True, 
-                proportional_edit_falloff='SMOOTH',
-                proportional_size=bump_radius,
-                release_confirm=True
-            )
-        
-        bpy.context.scene.tool_settings.proportional_edit_falloff = original_falloff
-        bpy.ops.object.mode_set(mode='OBJECT')
+        print(f"[INFO] Raising {len(self.riverbank_indices)} riverbank bumps...")
+        coords = self._read_vertex_coords()
+        x, y, z = self._split_axes(coords)
+        coords[:, 2] = z + self._raise_offsets(x, y, min_riverbank_height, max_riverbank_height, bump_radius)
+        self._write_vertex_coords(coords)
         print("[INFO] Finished raising riverbank.")
 
     
     def align_riverbank_edges(self, proportional_radius=1.8):
         print("[INFO] Aligning the z-coordinates of the riverbank boundary vertices to 0.")
 
-        # --- Perform all operations in a single Edit Mode session for stability ---
-        bpy.context.view_layer.objects.active = self.plane
-        bpy.ops.object.mode_set(mode='EDIT')
-
-        # Get the bmesh representation
-        bm = bmesh.from_edit_mesh(self.plane.data)
-        bm.verts.ensure_lookup_table()
+        boundary_indices = self._find_boundary_indices()
+        print(f"[INFO] Found {len(boundary_indices)} boundary vertices to align.")
+        if boundary_indices.size == 0:
+            return
 
-        # Find all boundary vertices, which is a more reliable way to get the edges of a plane
-        boundary_verts = [v for v in bm.verts if v.is_boundary]
-        
-        print(f"[INFO] Found {len(boundary_verts)} boundary vertices to align.")
-
-        # Set up proportional editing
-        original_falloff = bpy.context.scene.tool_settings.proportional_edit_falloff
-        bpy.context.scene.tool_settings.proportional_edit_falloff = 'SMOOTH'
-        bpy.context.tool_settings.mesh_select_mode = (True, False, False)
-
-        # Align each boundary vertex to Z=0 using proportional editing
-        for vert in boundary_verts:
-            # Deselect all and select the current vertex
-            bpy.ops.mesh.select_all(action='DESELECT')
-            vert.select = True
-            
-            # Update the mesh selection before the operator is called
-            bmesh.update_edit_mesh(self.plane.data)
-
-            # Calculate the translation needed to bring the vertex to Z=0
-            relative_translation = (0, 0, -vert.co.z)
-            
-            # Apply the translation
-            bpy.ops.transform.translate(
-                value=relative_translation,
-                orient_type='GLOBAL',
-                use_proportional_edit=True, 
-                proportional_edit_falloff='SMOOTH',
-                proportional_size=proportional_radius,
-                release_confirm=True
-            )
-
-        # Restore original settings and exit Edit Mode
-        bpy.context.scene.tool_settings.proportional_edit_falloff = original_falloff
-        bpy.ops.object.mode_set(mode='OBJECT')
+        coords = self._read_vertex_coords()
+        x, y, z = self._split_axes(coords)
+        coords[:, 2] = z + self._align_offsets(x, y, z, boundary_indices, proportional_radius)
+        self._write_vertex_coords(coords)
         print("[INFO] Finished aligning riverbank edges.")
+
+
+    def shape_riverbed(self, min_pit_depth=0.2, max_pit_depth=0.5, pit_radius=2.5,
+                       min_riverbank_height=0.0, max_riverbank_height=0.2, bump_radius=3.0,
+                       edge_radius=3.0):
+        """
+        Digs the riverbed, raises the riverbank and aligns the edges in one pass,
+        with a single read and a single write of the vertex coordinates.
+        Gives the same result as calling dig_riverbed(), raise_riverbank() and
+        align_riverbank_edges() in sequence.
+        """
+        if self.riverbed_indices.size == 0 or self.riverbank_indices.size == 0:
+            print("[ERROR] No riverbed vertices selected. Please run select_riverbed_vertices() first.")
+            return
+
+        print(f"[INFO] Shaping the riverbed: {len(self.riverbed_indices)} pits, "
+              f"{len(self.riverbank_indices)} riverbank bumps...")
+        coords = self._read_vertex_coords()
+        x, y, z = self._split_axes(coords)
+
+        # The XY positions never change, so one vertex grid serves all three steps
+        grid = build_vertex_grid(x, y, max(pit_radius, bump_radius, edge_radius))
+
+        # Dig and raise only depend on the XY positions, so their offsets can be summed
+        # before aligning the edges, which depends on the Z they produce.
+        z += self._dig_offsets(x, y, min_pit_depth, max_pit_depth, pit_radius, grid)
+        z += self._raise_offsets(x, y, min_riverbank_height, max_riverbank_height, bump_radius, grid)
+
+        boundary_indices = self._find_boundary_indices()
+        if boundary_indices.size > 0:
+            z += self._align_offsets(x, y, z, boundary_indices, edge_radius, grid)
+
+        # Re-interleave once for the write back
+        coords[:, 2] = z
+        self._write_vertex_coords(coords)
+        print("[INFO] Finished shaping the riverbed.")
         
 
     def create_riverbed(self):
@@ -281,9 +578,9 @@ class RiverbedGenerator:
         self.create_terrain(plane_width=20, plane_length=40, subdivisions=(38, 78))
 
         self.select_riverbed_vertices()
-        self.dig_riverbed(min_pit_depth=0.2, max_pit_depth=0.5, pit_radius=2.5)
-        self.raise_riverbank(min_riverbank_height=0.0, max_riverbank_height=0.2, bump_radius=3.0)    
-        self.align_riverbank_edges(proportional_radius=3.0)
+        self.shape_riverbed(min_pit_depth=0.2, max_pit_depth=0.5, pit_radius=2.5,
+                            min_riverbank_height=0.0, max_riverbank_height=0.2, bump_radius=3.0,
+                            edge_radius=3.0)
  
         ## shade_smooth() doesn't work here, 
         ## but it works well in rocky_river_terrain.py, after applying textures. 
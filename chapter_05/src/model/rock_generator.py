@@ -80,6 +80,25 @@ class RockGenerator:
             self.rock_object = None
 
 
+    def _ensure_smart_uv_project(self):
+        """
+        Unwraps the current rock with Smart UV Project, once per rock. The object is
+        tagged after unwrapping, so re-texturing the same rock, as apply_secondary_texture()
+        does after apply_texture(), reuses the UV map instead of solving it again.
+        """
+        if self.rock_object.get("smart_uv_projected") and self.rock_object.data.uv_layers:
+            print(f"[INFO] Reusing the Smart UV Project of {self.rock_object.name}.")
+            return
+
+        bpy.context.view_layer.objects.active = self.rock_object
+        bpy.ops.object.mode_set(mode='EDIT')
+        bpy.ops.mesh.select_all(action='SELECT')
+        bpy.ops.uv.smart_project()
+        bpy.ops.object.mode_set(mode='OBJECT')
+        self.rock_object["smart_uv_projected"] = True
+        print(f"[INFO] Created Smart UV Project for {self.rock_object.name}.")
+
+
     def apply_texture(self, texture_directory):
         """
         Applies a set of PBR textures to the current rock object.
@@ -92,20 +111,14 @@ class RockGenerator:
             return
 
         print(f"[INFO] Applying textures from {texture_directory} to {self.rock_object.name}.")
-        # First, create a UV map for the rock so textures can be applied correctly.
-        bpy.context.view_layer.objects.active = self.rock_object
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.uv.smart_project()
-        bpy.ops.object.mode_set(mode='OBJECT')
-        print(f"[INFO] Created Smart UV Project for {self.rock_object.name}.")       
+        # First, make sure the rock has a UV map so textures can be applied correctly.
+        self._ensure_smart_uv_project()
 
         try:
             self.texture_applier.set_object(self.rock_object)
             self.texture_applier.set_texture_directory(texture_directory)
 
-            self.texture_applier.create_base_nodes()
-            self.texture_applier.create_texture_nodes()
+            self.texture_applier.apply_texture()
             print(f"[SUCCESS] Preliminary textures applied to {self.rock_object.name}.")
         except (ValueError, FileNotFoundError) as e:
             print(f"[ERROR] Failed to apply preliminary textures: {e}")
@@ -123,20 +136,14 @@ class RockGenerator:
             return
 
         print(f"[INFO] Applying textures from {texture_directory} to {self.rock_object.name}.")
-        # First, create a UV map for the rock so textures can be applied correctly.
-        bpy.context.view_layer.objects.active = self.rock_object
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.uv.smart_project()
-        bpy.ops.object.mode_set(mode='OBJECT')
-        print(f"[INFO] Created Smart UV Project for {self.rock_object.name}.")       
+        # First, make sure the rock has a UV map so textures can be applied correctly.
+        self._ensure_smart_uv_project()
 
         try:
             self.texture_applier.set_object(self.rock_object)
             self.texture_applier.set_secondary_texture_directory(texture_directory)
 
-            self.texture_applier.create_secondary_base_nodes()
-            self.texture_applier.create_secondary_texture_nodes()
+            self.texture_applier.apply_another_texture()
             print(f"[SUCCESS] Secondary textures applied to {self.rock_object.name}.")
         except (ValueError, FileNotFoundError) as e:
             print(f"[ERROR] Failed to apply secondary textures: {e}")
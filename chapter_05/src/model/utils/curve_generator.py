@@ -1,19 +1,20 @@
 import numpy as np
-from scipy.interpolate import interp1d
-from scipy.special import comb as binomial_coefficient
-import random
+from scipy.interpolate import CubicSpline
+import functools
 
 class CurveGenerator:
     """
     A class to generate and interpolate curves for riverbanks.
     """
-    def __init__(self, width=10, length=20, subdivisions=(8, 18)):
+    def __init__(self, width=10, length=20, subdivisions=(8, 18), seed=None):
         """
         Initializes the generator with terrain dimensions.
+        A seed makes the random deviations, and so the curves, reproducible.
         """
         self.width = width
         self.length = length
         self.subdivisions = subdivisions
+        self.rng = np.random.default_rng(seed)
 
     def create_bezier_curve(self, num_deviations=10):
         deviations = self.create_deviations(num_deviations)
@@ -29,60 +30,110 @@ class CurveGenerator:
 
     def create_deviations(self, num_deviations=10):
         """
-        Creates a single list of (x, y) points with random deviations on one or both sides.
+        Creates an (N, 2) array of (x, y) points with random deviations on one or both sides.
+        The points are sorted by y, and points without a deviation have x = 0.
         """
         num_points = self.subdivisions[1] + 2
-        points = []
-        y_values = np.linspace(-0.5 * self.length, 0.5 * self.length, num_points)
-
-        for y in y_values:
-            points.append([0.0, y])
+        points = np.zeros((num_points, 2))
+        points[:, 1] = np.linspace(-0.5 * self.length, 0.5 * self.length, num_points)
 
         if num_deviations > num_points:
             num_deviations = num_points
-            
-        deviation_indices = random.sample(range(num_points), num_deviations)
-
-        for i in deviation_indices:
-            if random.choice([True, False]):
-                points[i][0] = random.uniform(-0.5 * self.width / 2.0, -0.2 * self.width / 2.0)
-            else:
-                points[i][0] = random.uniform(0.2 * self.width / 2.0, 0.5 * self.width / 2.0)
+        elif num_deviations <= 0:
+            # A straight bank, nothing to draw
+            return points
+
+        # Draw all deviations at once: which points, which side, and how far
+        deviation_indices = self.rng.choice(num_points, size=num_deviations, replace=False)
+        on_left = self.rng.integers(0, 2, size=num_deviations).astype(bool)
+        magnitudes = self.rng.uniform(0.2 * self.width / 2.0, 0.5 * self.width / 2.0, size=num_deviations)
+        points[deviation_indices, 0] = np.where(on_left, -magnitudes, magnitudes)
         return points
 
 
+    @staticmethod
+    def binomial_coefficients(n):
+        """
+        Returns C(n, 0) ... C(n, n) as floats, by the recurrence
+        C(n, k) = C(n, k - 1) * (n - k + 1) / k. Every step stays an exact integer
+        for the degrees used here, and a loop of n steps is cheaper than SciPy's
+        gamma-function path.
+        """
+        coefficients = np.empty(n + 1)
+        coefficients[0] = 1.0
+        for k in range(1, n + 1):
+            coefficients[k] = coefficients[k - 1] * (n - k + 1) / k
+        return coefficients
+
+
+    @staticmethod
+    def evaluate_bezier(control_points, t_values):
+        """
+        Evaluates a Bezier curve at all t values with Estrin's scheme, O(n) per point in
+        ceil(log2(n + 1)) dependent steps, where Horner would need n.
+
+        The Bernstein sum C(n, j) * (1 - t)^(n - j) * t^j * P_j is rewritten as
+        (1 - t)^n * sum C(n, j) * P_j * u^j with u = t / (1 - t) for t <= 0.5, and as
+        t^n * sum C(n, j) * P_(n - j) * u^j with u = (1 - t) / t above. Keeping u in [0, 1]
+        avoids the cancellation a conversion to monomial coefficients would suffer at
+        the degrees used for the waterlines.
+        """
+        n = len(control_points) - 1
+        weighted = CurveGenerator.binomial_coefficients(n)[:, None] * control_points
+
+        s_values = 1.0 - t_values
+        low = (t_values <= 0.5)[:, None]
+        ratio = np.where(t_values <= 0.5, t_values, s_values) / np.where(t_values <= 0.5, s_values, t_values)
+        scale = np.where(t_values <= 0.5, s_values, t_values) ** n
+
+        # Coefficients of u^k for every t, shape (n + 1, len(t_values), 2)
+        coefficients = np.where(low[None], weighted[:, None, :], weighted[::-1, None, :])
+        power = ratio[:, None]
+        while len(coefficients) > 1:
+            if len(coefficients) % 2:
+                coefficients = np.concatenate([coefficients, np.zeros_like(coefficients[:1])])
+            # Pair neighbouring terms: c_2k + c_(2k+1) * u^(2^stage)
+            coefficients = coefficients[0::2] + coefficients[1::2] * power
+            power = power * power
+        return coefficients[0] * scale[:, None]
+
+
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def bernstein_basis(n, m):
+        """
+        Returns the read-only (m, n + 1) Bernstein basis of degree n at m evenly spaced
+        t values in [0, 1], so a curve through control points P is basis @ P.
+        The degree and sample count only depend on the curve setup, so the matrix is
+        built once per (n, m), by evaluating the unit control points, and then reused.
+        """
+        basis = CurveGenerator.evaluate_bezier(np.eye(n + 1), np.linspace(0, 1, m))
+        basis.flags.writeable = False
+        return basis
+
+
     def interpolate_bezier(self, input_list):
-        """Helper to interpolate a single Bezier curve."""
-        control_points = np.array([p for p in input_list if p[0] != 0.0])
+        """Helper to interpolate a single Bezier curve. Returns an (N, 2) array of (x, y) points."""
+        points = np.asarray(input_list, dtype=float)
+        control_points = points[points[:, 0] != 0.0]
         if len(control_points) < 2:
-            return input_list
+            return points.copy()
 
-        t_values = np.linspace(0, 1, len(input_list))
         n = len(control_points) - 1
-        curve_points = np.zeros((len(t_values), 2))
+        curve_points = self.bernstein_basis(n, len(points)) @ control_points
 
-        for i, t in enumerate(t_values):
-            for j in range(n + 1):
-                basis = binomial_coefficient(n, j) * (1 - t)**(n - j) * t**j
-                curve_points[i] += basis * control_points[j]
-        
-        final_points = []
-        original_y = [p[1] for p in input_list]
+        original_y = points[:, 1]
         interp_x = np.interp(original_y, curve_points[:, 1], curve_points[:, 0])
-
-        for i in range(len(input_list)):
-            final_points.append([interp_x[i], original_y[i]])
-
-        return final_points
+        return np.column_stack([interp_x, original_y])
 
 
     def interpolate_bspline(self, input_list):
-        """Helper to interpolate a single B-spline curve."""
-        points = np.array(input_list)
+        """Helper to interpolate a single B-spline curve. Returns an (N, 2) array of (x, y) points."""
+        points = np.asarray(input_list, dtype=float)
         non_zero_points = points[points[:, 0] != 0.0]
 
         if len(non_zero_points) < 2:
-            return points.tolist()
+            return points.copy()
 
         x = non_zero_points[:, 1]
         y = non_zero_points[:, 0]
@@ -90,41 +141,46 @@ class CurveGenerator:
         x_full = np.concatenate(([points[0, 1]], x, [points[-1, 1]]))
         y_full = np.concatenate(([0], y, [0]))
 
-        _, unique_indices = np.unique(x_full, return_index=True)
-        x_unique = x_full[np.sort(unique_indices)]
-        y_unique = y_full[np.sort(unique_indices)]
+        # Sorted unique knots, which CubicSpline needs strictly increasing anyway
+        x_unique, first_indices = np.unique(x_full, return_index=True)
+        y_unique = y_full[first_indices]
 
-        kind = 'cubic' if len(x_unique) >= 4 else 'linear'
-        f = interp1d(x_unique, y_unique, kind=kind, fill_value="extrapolate")
-        
-        y_new = f(points[:, 1])
+        # The curve is evaluated at the original y values, which lie within x_unique,
+        # so the linear case is a plain np.interp with no extrapolation needed.
+        if len(x_unique) >= 4:
+            y_new = CubicSpline(x_unique, y_unique)(points[:, 1])
+        else:
+            y_new = np.interp(points[:, 1], x_unique, y_unique)
 
         max_x = 0.75 * self.width
         min_x = -max_x
         y_new_clamped = np.clip(y_new, min_x, max_x)
         
-        return [[y_new_clamped[i], points[i, 1]] for i in range(len(points))]
+        return np.column_stack([y_new_clamped, points[:, 1]])
 
 
-    def merge_lists(self, first_list, second_list):
+    def merge_lists(self, first_list, second_list, sort=False):
         """
-        Merges two lists of deviations into a single list representing riverbanks.
+        Merges two lists of deviations into a single (N, 3) array of
+        (x_left, x_right, y) rows representing riverbanks.
+        Both lists are expected sorted by y, as create_deviations returns them;
+        pass sort=True for points that may come in any order.
         """
         if len(first_list) != len(second_list):
             raise ValueError("Deviation lists must have the same length.")
 
+        left = np.asarray(first_list, dtype=float)
+        right = np.asarray(second_list, dtype=float)
+
         # Sort by y-coordinate to ensure correct pairing
-        left_sorted = sorted(first_list, key=lambda p: p[1])
-        right_sorted = sorted(second_list, key=lambda p: p[1])
-
-        merged_list = []
-        for l_point, r_point in zip(left_sorted, right_sorted):
-            x_left = l_point[0]
-            x_right = r_point[0]
-            y_avg = 0.5 * (l_point[1] + r_point[1])
-            merged_list.append([x_left, x_right, y_avg])
-            
-        return merged_list
+        if sort:
+            left = left[np.argsort(left[:, 1], kind='stable')]
+            right = right[np.argsort(right[:, 1], kind='stable')]
+        elif __debug__:
+            assert (np.diff(left[:, 1]) >= 0).all() and (np.diff(right[:, 1]) >= 0).all(), \
+                "Deviation lists must be sorted by y, or merged with sort=True."
+
+        return np.column_stack([left[:, 0], right[:, 0], 0.5 * (left[:, 1] + right[:, 1])])
     
 
     def interpolate_twin_beziers(self, merged_list):
@@ -132,21 +188,32 @@ class CurveGenerator:
         Interpolates a merged list of bank points using Bezier curves.
         Returns two lists of points, one for each bank.
         """
-        left_points = [[p[0], p[2]] for p in merged_list]
-        right_points = [[p[1], p[2]] for p in merged_list]
-
-        left_curve = self.interpolate_bezier(left_points)
-        right_curve = self.interpolate_bezier(right_points)
-
-        return left_curve, right_curve
+        merged = np.asarray(merged_list, dtype=float)
+        left_points = merged[:, [0, 2]]
+        right_points = merged[:, [1, 2]]
+
+        left_control = left_points[left_points[:, 0] != 0.0]
+        right_control = right_points[right_points[:, 0] != 0.0]
+        if len(left_control) != len(right_control) or len(left_control) < 2:
+            return self.interpolate_bezier(left_points), self.interpolate_bezier(right_points)
+
+        # Both banks have the same degree, so one basis product evaluates the pair
+        n = len(left_control) - 1
+        curve_points = self.bernstein_basis(n, len(merged)) @ np.hstack([left_control, right_control])
+
+        original_y = merged[:, 2]
+        left_x = np.interp(original_y, curve_points[:, 1], curve_points[:, 0])
+        right_x = np.interp(original_y, curve_points[:, 3], curve_points[:, 2])
+        return np.column_stack([left_x, original_y]), np.column_stack([right_x, original_y])
     
     def interpolate_twin_bsplines(self, merged_list):
         """
         Interpolates a merged list of bank points using B-spline curves.
         Returns two lists of points, one for each bank.
         """
-        left_points = [[p[0], p[2]] for p in merged_list]
-        right_points = [[p[1], p[2]] for p in merged_list]
+        merged = np.asarray(merged_list, dtype=float)
+        left_points = merged[:, [0, 2]]
+        right_points = merged[:, [1, 2]]
 
         left_curve = self.interpolate_bspline(left_points)
         right_curve = self.interpolate_bspline(right_points)
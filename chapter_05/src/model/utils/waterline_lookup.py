@@ -0,0 +1,31 @@
+import numpy as np
+
+
+def closest_path_indices(path_y, ys):
+    """
+    Returns, for every y in ys, the index of the path point whose y is closest.
+    The waterlines run along y, so after sorting the path by y a binary search
+    finds the two neighbours of each y, instead of scanning the whole path.
+    On a tie the lower path point wins, as np.argmin would pick it.
+
+    Both inputs are compared in float32, the precision Blender stores vertex
+    positions in, so the riverbed and the water surface break ties the same way.
+    """
+    path_y = np.asarray(path_y, dtype=np.float32)
+    ys = np.asarray(ys, dtype=np.float32)
+
+    order = np.argsort(path_y, kind='stable')
+    sorted_y = path_y[order]
+
+    upper = np.searchsorted(sorted_y, ys).clip(1, len(sorted_y) - 1)
+    lower = upper - 1
+    take_lower = np.abs(sorted_y[lower] - ys) <= np.abs(sorted_y[upper] - ys)
+    return order[np.where(take_lower, lower, upper)]
+
+
+def closest_x_along_path(path, ys):
+    """
+    Returns, for every y in ys, the x of the (N, 2) path point whose y is closest.
+    """
+    path = np.asarray(path, dtype=np.float32)
+    return path[closest_path_indices(path[:, 1], ys), 0]
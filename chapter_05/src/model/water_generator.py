@@ -6,6 +6,8 @@ import bmesh
 import random
 import numpy as np
 
+from model.utils.waterline_lookup import closest_path_indices, closest_x_along_path
+
 
 class WaterGenerator:
     """
@@ -154,35 +156,39 @@ class WaterGenerator:
         else:
             print(f"[ERROR] left_waterline and right_waterline cannot be empty list.")
 
-        left_path = np.array(self.left_waterline)
-        right_path = np.array(self.right_waterline)
+        left_path = np.array(self.left_waterline, dtype=np.float32)
+        right_path = np.array(self.right_waterline, dtype=np.float32)
 
         # 2. Select vertices based on their position between the two waterlines
         bpy.ops.object.mode_set(mode='OBJECT')
         bpy.context.view_layer.objects.active = self.water_plane
         self.water_plane.select_set(True)
 
+        # Read every vertex coordinate in one bulk copy, without bmesh wrappers
+        vertices = self.water_plane.data.vertices
+        coords = np.empty(len(vertices) * 3, dtype=np.float32)
+        vertices.foreach_get("co", coords)
+        coords = coords.reshape(-1, 3)
+
+        # Find the segment on water plane that is closest to the vertex's y-coordinate
+        # for both left and right waterlines, and check if the vertex's x-coordinate
+        # is within the riverbed boundaries
+        if np.array_equal(left_path[:, 1], right_path[:, 1]):
+            # Both waterlines are sampled at the same y values, so one search serves both
+            nearest = closest_path_indices(left_path[:, 1], coords[:, 1])
+            water_plane_left_x = left_path[nearest, 0]
+            water_plane_right_x = right_path[nearest, 0]
+        else:
+            water_plane_left_x = closest_x_along_path(left_path, coords[:, 1])
+            water_plane_right_x = closest_x_along_path(right_path, coords[:, 1])
+        outliers = (coords[:, 0] < water_plane_left_x) | (coords[:, 0] > water_plane_right_x)
+
+        # Only now open the BMesh, and fetch just the outliers by index
         bm_water = bmesh.new()
         bm_water.from_mesh(self.water_plane.data)
+        bm_water.verts.ensure_lookup_table()
 
-        outlier_vertex_indices = []
-
-        for vert in bm_water.verts:
-            vertex_co = np.array([vert.co.x, vert.co.y])
-            
-            # Find the segment on water plane that is closest to the vertex's y-coordinate
-            # for both left and right waterlines
-            left_distances_y = np.abs(left_path[:, 1] - vertex_co[1])
-            closest_left_index = np.argmin(left_distances_y)
-            water_plane_left_x = left_path[closest_left_index][0]
-
-            right_distances_y = np.abs(right_path[:, 1] - vertex_co[1])
-            closest_right_index = np.argmin(right_distances_y)
-            water_plane_right_x = right_path[closest_right_index][0]
-
-            # Check if the vertex's x-coordinate is within the riverbed boundaries
-            if vert.co.x < water_plane_left_x or vert.co.x > water_plane_right_x:
-                outlier_vertex_indices.append(vert)
+        outlier_vertex_indices = [bm_water.verts[i] for i in np.flatnonzero(outliers)]
 
         # 3. Delete the outlier vertices that beyond the waterlines. 
         print(f"\n[INFO] Deleting {len(outlier_vertex_indices)} outlier vertices from the water plane...")
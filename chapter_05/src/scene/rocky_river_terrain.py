@@ -3,14 +3,14 @@
 # 
 import os
 import sys
-import random
 import pprint
 
 import bpy
+import numpy as np
 
 
 class RockyRiverTerrain:
-    def __init__(self, plane_width=10, plane_length=20):
+    def __init__(self, plane_width=10, plane_length=20, seed=None):
         self.riverbed_generator = None 
         self.water_generator = None
         self.rock_generator = None
@@ -21,6 +21,7 @@ class RockyRiverTerrain:
         self.subdivisions = [(self.plane_width * 2 - 2), (self.plane_length * 2 - 2)]
 
         self.rocks = []
+        self.rng = np.random.default_rng(seed)
 
         try:
             from model.riverbed_generator import RiverbedGenerator
@@ -58,16 +59,15 @@ class RockyRiverTerrain:
         self.texture_applier.set_object(self.riverbed_generator.plane)
         self.texture_applier.set_texture_directory(rocky_texture_directory)
 
-        self.texture_applier.create_base_nodes()
-        self.texture_applier.create_texture_nodes()
+        self.texture_applier.apply_texture()
         # After some testing, 3.5 is an appropriate value for the displace strength. 
         self.texture_applier.create_displacement_modifier(disp_strength=3.5)
     
         # 3. Distort the flat to a riverbed. 
         self.riverbed_generator.select_riverbed_vertices()
-        self.riverbed_generator.dig_riverbed(min_pit_depth=0.2, max_pit_depth=0.5, pit_radius=2.5)
-        self.riverbed_generator.raise_riverbank(min_riverbank_height=0.0, max_riverbank_height=0.2, bump_radius=3.0)
-        self.riverbed_generator.align_riverbank_edges(proportional_radius=3.0)
+        self.riverbed_generator.shape_riverbed(min_pit_depth=0.2, max_pit_depth=0.5, pit_radius=2.5,
+                                               min_riverbank_height=0.0, max_riverbank_height=0.2, bump_radius=3.0,
+                                               edge_radius=3.0)
 
         # 4. Apply a moss texture to the riverbed. 
         moss_texture_directory = "/home/robot/movie_blender_studio/asset/texture/Moss002_2K-JPG"
@@ -100,31 +100,37 @@ class RockyRiverTerrain:
     def add_some_rocks(self, num_rocks=10):
         print(f"\n[INFO] Adding {num_rocks} rocks to the scene...")
 
-        # 1. Get all possible locations for the rocks from the riverbed vertices
-        riverbed_vertices = self.riverbed_generator.plane.data.vertices
-        possible_locations = [riverbed_vertices[i].co for i in self.riverbed_generator.riverbed_indices]
+        # 1. Pick the rock locations among the riverbed vertices
+        riverbed_indices = self.riverbed_generator.riverbed_indices
 
-        if len(possible_locations) < num_rocks:
+        if len(riverbed_indices) < num_rocks:
             print(f"[WARNING] Not enough vertices in riverbed to place {num_rocks} rocks.", end=" ")
-            print(f"Placing {len(possible_locations)} instead.")
-            num_rocks = len(possible_locations)
+            print(f"Placing {len(riverbed_indices)} instead.")
+            num_rocks = len(riverbed_indices)
 
-        # Randomly select locations for the rocks
-        selected_locations = random.sample(possible_locations, num_rocks)
+        # Randomly select locations for the rocks, reading only the chosen vertices
+        riverbed_vertices = self.riverbed_generator.plane.data.vertices
+        selected_indices = self.rng.choice(riverbed_indices, size=num_rocks, replace=False)
+        selected_locations = [riverbed_vertices[i].co for i in selected_indices.tolist()]
         
         # 2. Create some rocks, and apply rock and moss textures to them.
         rock_texture_files = "/home/robot/movie_blender_studio/asset/texture/Rock003_2K-JPG/"
         moss_texture_files = "/home/robot/movie_blender_studio/asset/texture/Moss002_2K-JPG"
+
+        # Randomize rock properties for all rocks at once: scale, skew and rotation per axis
+        min_scale = self.plane_width * 0.1
+        max_scale = self.plane_width * 0.25
+        draws = self.rng.uniform(0.0, 1.0, size=(num_rocks, 9))
+        scales = min_scale + draws[:, 0:3] * (max_scale - min_scale)
+        skews = draws[:, 3:6]
+        rotations = draws[:, 6:9] * 6.28318 # 2*pi
    
         for i, loc in enumerate(selected_locations):
             print(f"\n--- Creating Rock {i+1}/{num_rocks} ---")
             
-            # Randomize rock properties
-            min_scale = self.plane_width * 0.1
-            max_scale = self.plane_width * 0.25
-            scale = (random.uniform(min_scale, max_scale), random.uniform(min_scale, max_scale), random.uniform(min_scale, max_scale))
-            skew = (random.random(), random.random(), random.random())
-            rotation = (random.uniform(0, 6.28318), random.uniform(0, 6.28318), random.uniform(0, 6.28318)) # 2*pi
+            scale = tuple(scales[i].tolist())
+            skew = tuple(skews[i].tolist())
+            rotation = tuple(rotations[i].tolist())
 
             self.rock_generator.create_rock(scale=scale, skew=skew)
             if self.rock_generator.rock_object:
@@ -144,6 +150,28 @@ class RockyRiverTerrain:
         print(f"\n[SUCCESS] Finished adding {num_rocks} rocks.")
     
 
+    def move_rocks(self, offset=(0.0, 0.0, 0.0)):
+        """
+        Translates all rocks by an offset with one operator call, instead of
+        setting each rock's location separately.
+        """
+        rocks = [rock for rock in self.rocks if rock is not None]
+        if not rocks:
+            print("[WARN] No rocks to move.")
+            return
+
+        print(f"[INFO] Moving {len(rocks)} rocks by {offset}.")
+        if bpy.context.mode != 'OBJECT':
+            bpy.ops.object.mode_set(mode='OBJECT')
+
+        bpy.ops.object.select_all(action='DESELECT')
+        for rock in rocks:
+            rock.select_set(True)
+        bpy.context.view_layer.objects.active = rocks[0]
+
+        bpy.ops.transform.translate(value=offset, orient_type='GLOBAL')
+
+
     def create_hdri_background(self):
         print("\n[INFO] Creating HDRi landscape background...")
 
@@ -178,8 +206,7 @@ class RockyRiverTerrain:
         rocky_river_terrain.riverbed_generator.move_riverbed(location=(0, 0, dome_floor_z))
         rocky_river_terrain.water_generator.move_water(location=(0.0, 0.0, dome_floor_z))
 
-        for rock in rocky_river_terrain.rocks:
-            rock.location = (rock.location[0], rock.location[1], rock.location[2]+dome_floor_z)
+        rocky_river_terrain.move_rocks(offset=(0.0, 0.0, dome_floor_z))
         
 
 
@@ -1,7 +1,44 @@
 import bpy
 import os
+import re
 import sys
 import pprint
+import functools
+
+import numpy as np
+
+
+# Image files that can hold a texture map
+_TEXTURE_EXTENSION_RE = re.compile(r'\.(?:png|jpe?g|tif|exr)\Z', re.IGNORECASE)
+
+# The PBR slot of a texture file, from keywords in its name. The alternatives are
+# tried in order, so a name matching several slots gets the first one, and the
+# matched branch's group name is the slot.
+_TEXTURE_SLOT_RE = re.compile(
+    r'(?=.*(?:color|albedo|diff))(?P<color>)'
+    r'|(?=.*(?:displacement|height|disp))(?P<displacement>)'
+    r'|(?=.*rough)(?P<roughness>)'
+    r'|(?=.*(?:normal|nor))(?P<normal>)'
+    r'|(?=.*metal)(?P<metalness>)',
+    re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=256)
+def _scan_texture_files(texture_dir, mtime_ns):
+    """
+    Returns the PBR texture maps in a directory as a tuple of (slot, path) pairs.
+    Scans are shared by all ApplyTexture instances. The directory's modification
+    time is part of the key, so adding or removing files triggers a fresh scan.
+    """
+    texture_files = {}
+    with os.scandir(texture_dir) as entries:
+        for entry in entries:
+            if not entry.is_file() or not _TEXTURE_EXTENSION_RE.search(entry.name):
+                continue
+            slot = _TEXTURE_SLOT_RE.match(entry.name)
+            if slot:
+                texture_files[slot.lastgroup] = entry.path
+    return tuple(texture_files.items())
 
 
 class ApplyTexture:
@@ -10,21 +47,9 @@ class ApplyTexture:
     """
     def __init__(self, use_modifier = True):
         """
-        Initializes the texture application process.
+        Initializes the texture application process. The shader and modifier
+        generators are created on first use, see texture_generator and modifier_generator.
         """
-        self.texture_generator = None
-        self.modifier_generator = None
-
-        try:
-            from shader_modifier.shader_generator import ShaderGenerator
-            self.texture_generator = ShaderGenerator()
-
-            from shader_modifier.modifier_generator import ModifierGenerator
-            self.modifier_generator = ModifierGenerator()
-        except ImportError:
-            print("[ERROR] Could not import ApplyTexture class. Make sure 'apply_texture_asset.py' is in the correct directory.")
-            ApplyTexture = None
-
         self.mesh = None
         self.use_modifier = use_modifier
         
@@ -32,11 +57,38 @@ class ApplyTexture:
         self.texture_paths = {}
         self.secondary_texture_dir = None
         self.secondary_texture_paths = {}
+        self._secondary_texture_mtime = None
 
         self.material = None
         self.node_names = []
         self.secondary_node_names = []
 
+        # Loaded images by absolute path, so each texture file is decoded only once
+        self._image_cache = {}
+        # (absolute path, mtime, tolerance) -> result of _constant_image_value(), so each
+        # map's pixels are read once, not again for every mesh textured with it
+        self._constant_value_cache = {}
+
+
+    @functools.cached_property
+    def texture_generator(self):
+        """ The ShaderGenerator that builds the material's node tree, imported on first use. """
+        try:
+            from shader_modifier.shader_generator import ShaderGenerator
+        except ImportError:
+            print("[ERROR] Could not import ShaderGenerator class. Make sure 'shader_generator.py' is in the correct directory.")
+            return None
+        return ShaderGenerator()
+
+    @functools.cached_property
+    def modifier_generator(self):
+        """ The ModifierGenerator that adds the displacement modifier, imported on first use. """
+        try:
+            from shader_modifier.modifier_generator import ModifierGenerator
+        except ImportError:
+            print("[ERROR] Could not import ModifierGenerator class. Make sure 'modifier_generator.py' is in the correct directory.")
+            return None
+        return ModifierGenerator()
 
 
     def set_object(self, mesh_object=None):
@@ -58,28 +110,25 @@ class ApplyTexture:
     def set_secondary_texture_directory(self, secondary_texture_dir="/"):
         if not os.path.isdir(secondary_texture_dir):
             raise FileNotFoundError(f"Texture directory not found: {secondary_texture_dir}")
+
+        # Keep the maps of a directory that was already scanned and has not changed since
+        mtime_ns = os.stat(secondary_texture_dir).st_mtime_ns
+        if (self.secondary_texture_paths and self.secondary_texture_dir is not None
+                and os.path.abspath(secondary_texture_dir) == os.path.abspath(self.secondary_texture_dir)
+                and mtime_ns == self._secondary_texture_mtime):
+            print(f"[INFO] Secondary texture directory '{secondary_texture_dir}' is unchanged, reusing its texture maps.")
+            return
         
         self.secondary_texture_dir = secondary_texture_dir
+        self._secondary_texture_mtime = mtime_ns
         print(f"[INFO] Following is the images for the secondary texture.")
         self.secondary_texture_paths = self._scan_texture_directory(self.secondary_texture_dir)    
         print(f"[INFO] Found {len(self.secondary_texture_paths)} for the secondary texture maps.")
 
     def _scan_texture_directory(self, texture_dir):
-        """ Scans the directory for common PBR texture maps. """
-        texture_files = {}
-        for file in os.listdir(texture_dir):
-            if file.lower().endswith(('.png', '.jpg', '.jpeg', '.tif', '.exr')):
-                file_path = os.path.join(texture_dir, file)
-                if 'color' in file.lower() or 'albedo' in file.lower() or 'diff' in file.lower():
-                    texture_files['color'] = file_path
-                elif 'displacement' in file.lower() or 'height' in file.lower() or 'disp' in file.lower():
-                    texture_files['displacement'] = file_path
-                elif 'rough' in file.lower():
-                    texture_files['roughness'] = file_path
-                elif 'normal' in file.lower() or 'nor' in file.lower():
-                    texture_files['normal'] = file_path
-                elif 'metal' in file.lower():
-                    texture_files['metalness'] = file_path
+        """ Scans the directory for common PBR texture maps, reusing earlier scans. """
+        texture_dir = os.path.abspath(texture_dir)
+        texture_files = dict(_scan_texture_files(texture_dir, os.stat(texture_dir).st_mtime_ns))
         
         print(f"\n[INFO] texture_files in file directory '{texture_dir}':")
         pprint.pprint(texture_files)
@@ -87,6 +136,59 @@ class ApplyTexture:
         return texture_files
 
 
+    def _load_image(self, texture_image):
+        """ Returns the image datablock for a file, loading it only on first use. """
+        image_path = os.path.abspath(texture_image)
+        image = self._image_cache.get(image_path)
+        try:
+            if image is not None and image.name in bpy.data.images:
+                return image
+        except ReferenceError:
+            # The image was removed from bpy.data since it was cached
+            pass
+
+        image = bpy.data.images.load(image_path, check_existing=True)
+        self._image_cache[image_path] = image
+        return image
+
+
+    def _constant_image_value(self, texture_image, tolerance=1e-3):
+        """
+        Returns the value of a greyscale map whose pixels are all the same within
+        tolerance, or None when the map varies or its pixels cannot be read.
+        The result is cached per file until the file changes.
+        """
+        image_path = os.path.abspath(texture_image)
+        try:
+            mtime_ns = os.stat(image_path).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        cache_key = (image_path, mtime_ns, tolerance)
+        if cache_key in self._constant_value_cache:
+            return self._constant_value_cache[cache_key]
+
+        constant = self._read_constant_image_value(image_path, tolerance)
+        self._constant_value_cache[cache_key] = constant
+        return constant
+
+
+    def _read_constant_image_value(self, texture_image, tolerance):
+        """ Reads every pixel of a map for _constant_image_value(). """
+        image = self._load_image(texture_image)
+        image.colorspace_settings.name = 'Non-Color'
+
+        width, height = image.size
+        if width * height == 0:
+            return None
+
+        pixels = np.empty(width * height * image.channels, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+        color = pixels.reshape(-1, image.channels)[:, :3]
+        if color.max() - color.min() >= tolerance:
+            return None
+        return float(color.mean())
+
+
     def get_node_by_name(self, node_name:str):
         node_obj = self.texture_generator.get_node_by_name(node_name)
         return node_obj
@@ -312,116 +414,15 @@ class ApplyTexture:
             print("[INFO] Creating image texture nodes...")
         else:
             print("[ERROR] Principled_BSDF_Node not created yet, run create_base_nodes() first.")
+            return
 
-        # Create and connect nodes for each texture type found
-        node_y = 1300
-
-        if 'color' in self.texture_paths:
-            node_y = node_y - 300
-            color_node_name = "Color_Node"
-            color_node = self.create_imagetexture_node(
-                texture_image = self.texture_paths['color'], 
-                node_name = color_node_name, 
-                node_location = (-300, node_y)
-            )
-            self.node_names.append(color_node_name)
-            color_node.image.colorspace_settings.name = 'sRGB'
-
-            self.texture_generator.create_link_via_sockets(
-                coordinate_mapping_node.outputs[0],  # Vector
-                color_node.inputs[0]    # Vector                
-            )
-            self.texture_generator.create_link_via_sockets(
-                color_node.outputs[0],  # Color
-                principled_bsdf_node.inputs[0]    # Base Color                
-            )
-
-        if 'roughness' in self.texture_paths:
-            node_y = node_y - 300
-            rough_node_name = "Rough_Node"
-            rough_node =  self.create_imagetexture_node(
-                texture_image = self.texture_paths['roughness'], 
-                node_name = rough_node_name, 
-                node_location = (-300, node_y)
-            )      
-            self.node_names.append(rough_node_name)
-            rough_node.image.colorspace_settings.name = 'Non-Color'
-
-            self.texture_generator.create_link_via_sockets(
-                coordinate_mapping_node.outputs[0],  # Vector
-                rough_node.inputs[0]    # Vector                
-            )
-            self.texture_generator.create_link_via_sockets(
-                rough_node.outputs[0],  # Color
-                principled_bsdf_node.inputs[2]    # Roughness                
-            )
-
-        if 'normal' in self.texture_paths:
-            node_y = node_y - 300
-            normal_node_name = "Normal_Node"
-            normal_map_node_name = "Normal_Map_Node"
-            normal_node, normal_map_node = self.create_normal_node(
-                texture_image = self.texture_paths['normal'], 
-                normal_node_name = normal_node_name, 
-                normal_map_node_name = normal_map_node_name, 
-                node_location = (-300, node_y)
-            )     
-            self.node_names.append(normal_node_name) 
-            self.node_names.append(normal_map_node_name) 
-
-            self.texture_generator.create_link_via_sockets(
-                coordinate_mapping_node.outputs[0],  # Vector
-                normal_node.inputs[0]    # Vector                
-            )
-            self.texture_generator.create_link_via_sockets(
-                normal_map_node.outputs[0],       # Normal
-                principled_bsdf_node.inputs[5]    # Normal                
-            )
-
-        if 'metalness' in self.texture_paths:
-            node_y = node_y - 300
-            metal_node_name = "Metal_Node"
-            metal_node = self.create_imagetexture_node(
-                texture_image = self.texture_paths['metalness'], 
-                node_name = metal_node_name, 
-                node_location = (-300, node_y)
-            )    
-            self.node_names.append(metal_node_name)   
-            metal_node.image.colorspace_settings.name = 'Non-Color'
-
-            self.texture_generator.create_link_via_sockets(
-                coordinate_mapping_node.outputs[0],  # Vector
-                metal_node.inputs[0]                 # Vector                
-            )
-            self.texture_generator.create_link_via_sockets(
-                metal_node.outputs[0],            # Normal
-                principled_bsdf_node.inputs[1]    # Normal                
-            )
-
-        if 'displacement' in self.texture_paths:
-            # If use modifier, then don't do anything here. 
-            # Instead, call create_displacement_modifier() in a separated step.
-            if not self.use_modifier:
-                node_y = node_y - 300
-                texture_node_name = "Displace_Texture_Node", 
-                displace_node_name = "Displace_Map_Node", 
-                displace_texture_node, displace_map_node = self.create_displacement_node(
-                    texture_image = self.texture_paths['displacement'], 
-                    texture_node_name = texture_node_name, 
-                    displace_node_name = displace_node_name, 
-                    node_location = (-300, node_y)
-                )
-                self.node_names.append(texture_node_name)   
-                self.node_names.append(displace_node_name)   
-
-                self.texture_generator.create_link_via_sockets(
-                    coordinate_mapping_node.outputs[0],  # Vector
-                    displace_texture_node.inputs[0]              # Vector             
-                )
-                self.texture_generator.create_link_via_sockets(
-                    displace_map_node.outputs[0],     # Displacement
-                    output_node.inputs[2]         # Displacement                
-                )
+        self._create_pbr_texture_nodes(
+            texture_paths = self.texture_paths,
+            principled_bsdf_node = principled_bsdf_node,
+            output_node = output_node,
+            coordinate_mapping_node = coordinate_mapping_node,
+            start_y = 1300
+        )
 
 
     def create_secondary_texture_nodes(self):
@@ -439,122 +440,123 @@ class ApplyTexture:
             print("[INFO] Creating secondary image texture nodes...")
         else:
             print("[ERROR] The secondary_Principled_BSDF node not created yet, run create_secondary_base_nodes() first.")
+            return
 
-        # Create and connect nodes for each texture type found
-        node_y = -200
-        if 'color' in self.secondary_texture_paths:
-            node_y = node_y - 300
-            color_node_name = "Secondary_Color_Node"
-            color_node = self.create_imagetexture_node(
-                texture_image = self.secondary_texture_paths['color'], 
-                node_name = color_node_name, 
-                node_location = (-300, node_y)
-            )
-            self.node_names.append(color_node_name)
-            color_node.image.colorspace_settings.name = 'sRGB'
-            color_node.projection = 'BOX'
-            color_node.projection_blend = 0.2
+        self._create_pbr_texture_nodes(
+            texture_paths = self.secondary_texture_paths,
+            principled_bsdf_node = principled_bsdf_node,
+            output_node = output_node,
+            coordinate_mapping_node = coordinate_mapping_node,
+            start_y = -200,
+            name_prefix = "Secondary_",
+            projection = 'BOX',
+            projection_blend = 0.2
+        )
 
-            self.texture_generator.create_link_via_sockets(
-                coordinate_mapping_node.outputs[0],  # Vector
-                color_node.inputs[0]    # Vector                
-            )
-            self.texture_generator.create_link_via_sockets(
-                color_node.outputs[0],  # Color
-                principled_bsdf_node.inputs[0]    # Base Color                
-            )
 
-        if 'roughness' in self.secondary_texture_paths:
-            node_y = node_y - 300
-            rough_node_name = "Secondary_Rough_Node"
-            rough_node =  self.create_imagetexture_node(
-                texture_image = self.secondary_texture_paths['roughness'], 
-                node_name = rough_node_name, 
-                node_location = (-300, node_y)
-            )      
-            self.node_names.append(rough_node_name)
-            rough_node.image.colorspace_settings.name = 'Non-Color'
-            rough_node.projection = 'BOX'
-            rough_node.projection_blend = 0.2
+    # The texture maps in the order their nodes are stacked, one row per map:
+    # (slot, node kind, texture node name, map node name, Principled BSDF input, color space).
+    # Normal and displacement textures get their color space and map node from
+    # create_normal_node() and create_displacement_node(), and the displacement map
+    # feeds the material output rather than the BSDF.
+    _PBR_TEXTURE_SPEC = (
+        ('color',        'image',        "Color_Node",            None,                0,    'sRGB'),
+        ('roughness',    'image',        "Rough_Node",            None,                2,    'Non-Color'),
+        ('normal',       'normal',       "Normal_Node",           "Normal_Map_Node",   5,    None),
+        ('metalness',    'image',        "Metal_Node",            None,                1,    'Non-Color'),
+        ('displacement', 'displacement', "Displace_Texture_Node", "Displace_Map_Node", None, None),
+    )
+
+    # Scalar maps that are often shipped as one flat value, e.g. an all-black metalness.
+    # A uniform one is folded into the BSDF input instead of sampling a texture.
+    _FOLDABLE_SLOTS = ('roughness', 'metalness')
+
+    def _texture_node_rows(self, texture_paths, principled_bsdf_node):
+        """
+        Returns the _PBR_TEXTURE_SPEC rows that need texture nodes. Uniform scalar maps
+        are folded into their BSDF input here instead.
+        """
+        rows = []
+        for row in self._PBR_TEXTURE_SPEC:
+            slot, kind, _, _, bsdf_input, _ = row
+            if slot not in texture_paths:
+                continue
 
-            self.texture_generator.create_link_via_sockets(
-                coordinate_mapping_node.outputs[0],  # Vector
-                rough_node.inputs[0]    # Vector                
-            )
-            self.texture_generator.create_link_via_sockets(
-                rough_node.outputs[0],  # Color
-                principled_bsdf_node.inputs[2]    # Roughness                
-            )
+            # If use modifier, then don't do anything here. 
+            # Instead, call create_displacement_modifier() in a separated step.
+            if kind == 'displacement' and self.use_modifier:
+                continue
 
-        if 'normal' in self.secondary_texture_paths:
-            node_y = node_y - 300
-            normal_node_name = "Secondary_Normal_Node"
-            normal_map_node_name = "Secondary_Normal_Map_Node"
-            normal_node, normal_map_node = self.create_normal_node(
-                texture_image = self.secondary_texture_paths['normal'], 
-                normal_node_name = normal_node_name, 
-                normal_map_node_name = normal_map_node_name, 
-                node_location = (-300, node_y)
-            )     
-            self.node_names.append(normal_node_name) 
-            self.node_names.append(normal_map_node_name) 
-            normal_node.projection = 'BOX'
-            normal_node.projection_blend = 0.2
+            if slot in self._FOLDABLE_SLOTS:
+                constant = self._constant_image_value(texture_paths[slot])
+                if constant is not None:
+                    principled_bsdf_node.inputs[bsdf_input].default_value = constant
+                    print(f"[INFO] The {slot} map is uniform, set the BSDF input to {constant:.3f} instead of adding a texture node.")
+                    continue
+
+            rows.append(row)
+        return rows
 
-            self.texture_generator.create_link_via_sockets(
-                coordinate_mapping_node.outputs[0],  # Vector
-                normal_node.inputs[0]    # Vector                
-            )
-            self.texture_generator.create_link_via_sockets(
-                normal_map_node.outputs[0],       # Normal
-                principled_bsdf_node.inputs[5]    # Normal                
-            )
 
-        if 'metalness' in self.secondary_texture_paths:
-            node_y = node_y - 300
-            metal_node_name = "Secondary_Metal_Node"
-            metal_node = self.create_imagetexture_node(
-                texture_image = self.secondary_texture_paths['metalness'], 
-                node_name = metal_node_name, 
-                node_location = (-300, node_y)
-            )    
-            self.node_names.append(metal_node_name)   
-            metal_node.image.colorspace_settings.name = 'Non-Color'
-            metal_node.projection = 'BOX'
+    def _create_pbr_texture_nodes(self, texture_paths, principled_bsdf_node, output_node, coordinate_mapping_node,
+                                  start_y=0, name_prefix="", projection=None, projection_blend=0.0):
+        """
+        Creates and connects the nodes for each texture map found, following _PBR_TEXTURE_SPEC.
+        The nodes are stacked 300 apart below start_y, one row per map, without gaps.
+        """
+        rows = self._texture_node_rows(texture_paths, principled_bsdf_node)
+        for row_number, (slot, kind, node_name, map_node_name, bsdf_input, colorspace) in enumerate(rows, start=1):
+            node_name = name_prefix + node_name
+            node_location = (-300, start_y - 300 * row_number)
+
+            if kind == 'normal':
+                map_node_name = name_prefix + map_node_name
+                tex_node, map_node = self.create_normal_node(
+                    texture_image = texture_paths[slot], 
+                    normal_node_name = node_name, 
+                    normal_map_node_name = map_node_name, 
+                    node_location = node_location
+                )
+            elif kind == 'displacement':
+                map_node_name = name_prefix + map_node_name
+                tex_node, map_node = self.create_displacement_node(
+                    texture_image = texture_paths[slot], 
+                    texture_node_name = node_name, 
+                    displace_node_name = map_node_name, 
+                    node_location = node_location
+                )
+            else:
+                tex_node = self.create_imagetexture_node(
+                    texture_image = texture_paths[slot], 
+                    node_name = node_name, 
+                    node_location = node_location
+                )
+                map_node = None
+                tex_node.image.colorspace_settings.name = colorspace
+
+            self.node_names.append(node_name)
+            if map_node is not None:
+                self.node_names.append(map_node_name)
+
+            if projection is not None:
+                tex_node.projection = projection
+                tex_node.projection_blend = projection_blend
 
             self.texture_generator.create_link_via_sockets(
                 coordinate_mapping_node.outputs[0],  # Vector
-                metal_node.inputs[0]                 # Vector                
+                tex_node.inputs[0]    # Vector                
             )
-            self.texture_generator.create_link_via_sockets(
-                metal_node.outputs[0],            # Normal
-                principled_bsdf_node.inputs[1]    # Normal                
-            )
-
-        if 'displacement' in self.secondary_texture_paths:
-            # If use modifier, then don't do anything here. 
-            # Instead, call create_displacement_modifier() in a separated step.
-            if not self.use_modifier:
-                node_y = node_y - 300
-                texture_node_name = "Secondary_Displace_Texture_Node"
-                displace_node_name = "Secondary_Displace_Map_Node"
-                displace_texture_node, displace_map_node = self.create_displacement_node(
-                    texture_image = self.secondary_texture_paths['displacement'], 
-                    texture_node_name = texture_node_name, 
-                    displace_node_name = displace_node_name, 
-                    node_location = (-300, node_y)
-                )
-                self.node_names.append(texture_node_name)   
-                self.node_names.append(displace_node_name)   
-                displace_texture_node.projection = 'BOX'
 
+            source_node = map_node if map_node is not None else tex_node
+            if kind == 'displacement':
                 self.texture_generator.create_link_via_sockets(
-                    coordinate_mapping_node.outputs[0],  # Vector
-                    displace_texture_node.inputs[0]              # Vector             
+                    source_node.outputs[0],     # Displacement
+                    output_node.inputs[2]         # Displacement                
                 )
+            else:
                 self.texture_generator.create_link_via_sockets(
-                    displace_map_node.outputs[0],     # Displacement
-                    output_node.inputs[2]         # Displacement                
+                    source_node.outputs[0],     # Color, or Normal from the normal map
+                    principled_bsdf_node.inputs[bsdf_input]
                 )
 
 
@@ -568,7 +570,7 @@ class ApplyTexture:
         )
         
         # Load image and set color space
-        tex_node.image = bpy.data.images.load(texture_image)
+        tex_node.image = self._load_image(texture_image)
         return tex_node
 
 
@@ -581,7 +583,7 @@ class ApplyTexture:
         )
         
         # Load image and set color space
-        tex_node.image = bpy.data.images.load(texture_image)
+        tex_node.image = self._load_image(texture_image)
         tex_node.image.colorspace_settings.name = 'Non-Color'
 
         # Create normal map node
@@ -610,7 +612,7 @@ class ApplyTexture:
         )
         
         # Load image and set color space
-        tex_node.image = bpy.data.images.load(texture_image)
+        tex_node.image = self._load_image(texture_image)
         tex_node.image.colorspace_settings.name = 'Non-Color'
         
         # Create displacement node
@@ -649,17 +651,22 @@ class ApplyTexture:
         Usually, only one way is selected to use. 
         However, it is okay to use both. The rendering effect will look like doubly displaced. 
         """
-        # Prepare the mesh for UV mapping
-        bpy.context.view_layer.objects.active = self.mesh
-        bpy.ops.object.mode_set(mode='EDIT')
-        bpy.ops.mesh.select_all(action='SELECT')
-        bpy.ops.uv.smart_project()
-        bpy.ops.object.mode_set(mode='OBJECT')
+        # Prepare the mesh for UV mapping, unless it was already unwrapped with
+        # Smart UV Project, e.g. by RockGenerator, which uses the same tag.
+        if self.mesh.get("smart_uv_projected") and self.mesh.data.uv_layers:
+            print(f"[INFO] Reusing the Smart UV Project of {self.mesh.name}.")
+        else:
+            bpy.context.view_layer.objects.active = self.mesh
+            bpy.ops.object.mode_set(mode='EDIT')
+            bpy.ops.mesh.select_all(action='SELECT')
+            bpy.ops.uv.smart_project()
+            bpy.ops.object.mode_set(mode='OBJECT')
+            self.mesh["smart_uv_projected"] = True
 
         try:
             # Load the displacement texture
             path = self.texture_paths['displacement']
-            disp_image = bpy.data.images.load(path, check_existing=True)
+            disp_image = self._load_image(path)
             disp_image.colorspace_settings.name = 'Non-Color'
         except Exception as e:
             print(f"[ERROR] Could not load displacement texture: {e}")
@@ -692,6 +699,16 @@ class ApplyTexture:
         print(f"[INFO] Created displacement modifier using ModifierGenerator.")
         return disp_mod
 
+
+    def apply_texture(self):
+        """
+        Builds the material for the primary texture, its base nodes and texture nodes,
+        as one batch of node tree edits, so the tree is updated once at the end.
+        """
+        with self.texture_generator.batch():
+            self.create_base_nodes()
+            self.create_texture_nodes()
+
     
     def apply_another_texture(self, secondary_texture_dir=""):
         # 1. Verify secondary_texture_dir value
@@ -709,11 +726,12 @@ class ApplyTexture:
             print(f"[ERROR] 'secondary_texture_dir'='{secondary_texture_dir}' is invalid")
             return
 
-        # 2. Create the commonly used shader nodes for the secondary texture
-        self.create_secondary_base_nodes()
+        with self.texture_generator.batch():
+            # 2. Create the commonly used shader nodes for the secondary texture
+            self.create_secondary_base_nodes()
 
-        # 3. Create the textures nodes for the secondary texture
-        self.create_secondary_texture_nodes()
+            # 3. Create the textures nodes for the secondary texture
+            self.create_secondary_texture_nodes()
 
 
 
@@ -774,8 +792,7 @@ class ApplyTexture:
             
             # 2. Apply the preliminary texture, wood.
             texture_applier.set_texture_directory(wood_texture_directory)
-            texture_applier.create_base_nodes()
-            texture_applier.create_texture_nodes()
+            texture_applier.apply_texture()
             print(f"[INFO] Texture shader graph created successfully.")
 
             texture_applier.create_displacement_modifier()
@@ -784,9 +801,7 @@ class ApplyTexture:
             # 3. Apply the secondary texture, moss.
             #    It will look very stranges with moss texture. For testing purpose only.
             texture_applier.use_modifier = False
-            texture_applier.set_secondary_texture_directory(moss_texture_directory)
-            texture_applier.create_secondary_base_nodes()
-            texture_applier.create_secondary_texture_nodes()
+            texture_applier.apply_another_texture(moss_texture_directory)
             print(f"[INFO] Secondary texture shader graph created successfully.")
 
 
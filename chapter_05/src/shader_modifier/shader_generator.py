@@ -1,4 +1,28 @@
 import bpy
+import bmesh
+import logging
+from contextlib import contextmanager
+
+# Per-node/per-link messages go through this logger at DEBUG level, so the
+# %-style arguments are only formatted when debug output is enabled.
+_log = logging.getLogger("ShaderGenerator")
+
+
+def _hashable(value):
+    """
+    Turns a node attribute value into something usable in a dict key. Data-blocks
+    such as images are identified by name; returns None for anything else that
+    cannot be compared as a constant.
+    """
+    if isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, bpy.types.ID):
+        return ("ID", value.name)
+    try:
+        return tuple(_hashable(item) for item in value)
+    except TypeError:
+        return None
+
 
 class ShaderGenerator:
     """
@@ -6,6 +30,23 @@ class ShaderGenerator:
     their shader node trees.
     """
 
+    # Node types with no input sockets. Two of these with the same attributes
+    # always produce the same output, so create_node(dedupe=True) shares one instance.
+    DEDUPE_NODE_TYPES = {
+        'ShaderNodeTexCoord',
+        'ShaderNodeRGB',
+        'ShaderNodeValue',
+        'ShaderNodeUVMap',
+        'ShaderNodeNewGeometry',
+        'ShaderNodeObjectInfo',
+        'ShaderNodeLightPath',
+        'ShaderNodeCameraData',
+    }
+
+    # bl_idname -> {attribute name: 'input' or 'prop'}, built once per node type
+    # so set_node_attribute() needs one dict lookup instead of two RNA probes.
+    _attr_cache = {}
+
     def __init__(self):
         """
         Initializes the TextureGenerator instance with an object to apply materials to.
@@ -13,6 +54,17 @@ class ShaderGenerator:
         self.obj = None
         self.material = None
         self.node_tree = None
+        # Nodes created through create_node(), keyed by the requested name, so
+        # repeated lookups skip the RNA name scan of node_tree.nodes.
+        self._nodes = {}
+        # (node_type, attributes) -> node, for the types in DEDUPE_NODE_TYPES.
+        self._intern = {}
+        # (from_socket, to_socket) pairs queued while inside batch(); None when
+        # links are created immediately.
+        self._pending_links = None
+        # Input socket pointer -> links into it. Socket.links scans every link in
+        # the tree, so rewires look here instead. None means it must be rebuilt.
+        self._incoming = None
 
 
     def set_object(self, mesh_obj):
@@ -27,7 +79,9 @@ class ShaderGenerator:
     def create_material(self, mat_name):
         """
         Creates a new material, enables its node tree, and applies it to the object.
-        It also sets the instance's active material and node_tree.
+        It also sets the instance's active material and node_tree. An existing
+        material with the same name is reused with an emptied node tree instead
+        of leaving it orphaned and allocating 'mat_name.001'.
 
         Args:
             mat_name (str): The name for the new material.
@@ -39,37 +93,88 @@ class ShaderGenerator:
             print(f"[ERROR] The 'self.obj' is None, please set 'self.obj' first, after then you can use 'create_material()'.")
             return
         
-        self.material = bpy.data.materials.new(name=mat_name)
+        self.material = bpy.data.materials.get(mat_name)
+        if self.material is None:
+            self.material = bpy.data.materials.new(name=mat_name)
         self.material.use_nodes = True
         self.node_tree = self.material.node_tree
         
+        # Clearing the nodes also drops every link between them.
         self.node_tree.nodes.clear()
+        self._nodes.clear()
+        self._intern.clear()
+        if self._pending_links is not None:
+            self._pending_links.clear()
+        self._incoming = {}
             
         if self.obj.data.materials:
             self.obj.data.materials[0] = self.material
         else:
             self.obj.data.materials.append(self.material)
         
-        print(f"[INFO] Material '{mat_name}' created and assigned.")
+        _log.debug("Material %s created and assigned.", mat_name)
         return self.material
 
 
-    def create_node(self, node_type, node_name, attributes=None, location=(0, 0)):
+    def release_material(self, mat_name):
+        """
+        Empties a material's node tree but keeps the data-block for reuse by a
+        later create_material() call with the same name.
+        """
+        material = bpy.data.materials.get(mat_name)
+        if material is None:
+            print(f"[ERROR] Material '{mat_name}' not found.")
+            return
+
+        if material.node_tree:
+            material.node_tree.nodes.clear()
+        material.use_fake_user = False
+        if material == self.material:
+            # The cached nodes and links were freed with the tree; the link index
+            # is rebuilt on demand.
+            self._nodes.clear()
+            self._intern.clear()
+            if self._pending_links is not None:
+                self._pending_links.clear()
+            self._incoming = None
+        _log.debug("Material %s released.", mat_name)
+
+
+    def create_node(self, node_type, node_name, attributes=None, location=(0, 0), dedupe=False):
         """
         Creates a new shader node and sets its attributes.
+
+        With dedupe=True, an input-less node (see DEDUPE_NODE_TYPES) that matches
+        a node created the same way, by type and attributes, is not created again;
+        the existing node is returned and node_name becomes an alias for it. By
+        default every call creates its own node, at its own location.
         """
         if not self.node_tree:
             print("[ERROR] Node tree not set. Create a material first.")
             return None
 
+        intern_key = None
+        if dedupe and node_type in self.DEDUPE_NODE_TYPES:
+            frozen_attributes = tuple(sorted((attr, _hashable(value)) for attr, value in (attributes or {}).items()))
+            if all(value is not None for _, value in frozen_attributes):
+                intern_key = (node_type, frozen_attributes)
+                shared_node = self._intern.get(intern_key)
+                if shared_node is not None:
+                    self._nodes[node_name] = shared_node
+                    _log.debug("Reused node %s for %s.", shared_node.name, node_name)
+                    return shared_node
+
         new_node = self.node_tree.nodes.new(type=node_type)
         new_node.name = node_name
+        self._nodes[node_name] = new_node
         new_node.location = location
         
         if attributes:
             self.set_node_attribute(node_name, attributes)
+        if intern_key is not None:
+            self._intern[intern_key] = new_node
         
-        print(f"[INFO] Created node '{node_name}' of type '{node_type}'.")
+        _log.debug("Created node %s of type %s.", node_name, node_type)
         return new_node
 
     def set_node_attribute(self, node_name, attributes):
@@ -80,18 +185,95 @@ class ShaderGenerator:
             print("[ERROR] Node tree not set. Create a material first.")
             return
 
-        target_node = self.node_tree.nodes.get(node_name)
+        target_node = self._lookup_node(node_name)
         if target_node:
+            attr_kinds = self._get_attr_kinds(target_node)
             for attr, value in attributes.items():
-                if attr in target_node.inputs:
+                attr_kind = attr_kinds.get(attr)
+                if attr_kind == 'input':
                     target_node.inputs[attr].default_value = value
-                elif hasattr(target_node, attr):
+                elif attr_kind == 'prop':
                     setattr(target_node, attr, value)
-            print(f"[INFO] Attributes for node '{node_name}' updated.")
+            _log.debug("Attributes for node %s updated.", node_name)
         else:
             print(f"[ERROR] Node '{node_name}' not found.")
 
 
+    @contextmanager
+    def batch(self, prune=False):
+        """
+        Groups a run of node and link edits into one node tree update. Links are
+        queued and created together on exit, followed by a single update_tag().
+        With prune=True, nodes left unreachable from the output are removed
+        after the links are flushed.
+        """
+        if self._pending_links is not None:
+            # Already batching; the outermost block flushes.
+            yield self
+            return
+
+        self._pending_links = []
+        try:
+            yield self
+        finally:
+            pending_links = self._pending_links
+            self._pending_links = None
+            if self.node_tree:
+                for from_socket, to_socket in pending_links:
+                    self._link_now(from_socket, to_socket)
+                if prune:
+                    self.prune_disconnected()
+                self.node_tree.update_tag()
+                _log.debug("Flushed %d batched link(s).", len(pending_links))
+
+    def _new_link(self, from_socket, to_socket):
+        if self._pending_links is not None:
+            self._pending_links.append((from_socket, to_socket))
+        else:
+            self._link_now(from_socket, to_socket)
+
+    def _link_now(self, from_socket, to_socket):
+        link = self.node_tree.links.new(from_socket, to_socket)
+        if self._incoming is not None:
+            socket_key = to_socket.as_pointer()
+            if to_socket.is_multi_input:
+                self._incoming.setdefault(socket_key, []).append(link)
+            else:
+                # links.new() replaces any existing link into a single-input socket.
+                self._incoming[socket_key] = [link]
+        return link
+
+    def _rebuild_link_index(self):
+        """
+        Rebuilds the incoming-link index from the node tree. Call this after
+        changing links without going through the generator.
+        """
+        self._incoming = {}
+        for link in self.node_tree.links:
+            self._incoming.setdefault(link.to_socket.as_pointer(), []).append(link)
+
+    @classmethod
+    def _get_attr_kinds(cls, node):
+        """
+        Returns the attribute table for the node's type, building it on first use.
+        Input sockets take precedence over RNA properties of the same name.
+        """
+        # Group nodes get their sockets from the linked group, so they can differ per instance.
+        if node.bl_idname == 'ShaderNodeGroup':
+            return cls._build_attr_kinds(node)
+
+        attr_kinds = cls._attr_cache.get(node.bl_idname)
+        if attr_kinds is None:
+            attr_kinds = cls._build_attr_kinds(node)
+            cls._attr_cache[node.bl_idname] = attr_kinds
+        return attr_kinds
+
+    @staticmethod
+    def _build_attr_kinds(node):
+        attr_kinds = {prop_name: 'prop' for prop_name in node.bl_rna.properties.keys()}
+        attr_kinds.update((input_name, 'input') for input_name in node.inputs.keys())
+        return attr_kinds
+
     def create_link_via_sockets(self, from_node_output, to_node_input):
         """
         Creates a new link between two nodes.
@@ -101,9 +283,9 @@ class ShaderGenerator:
             return
         
         if from_node_output and to_node_input:
-            self.node_tree.links.new(from_node_output, to_node_input)
-            print(f"[INFO] Link created from '{from_node_output.node.name}.{from_node_output.name}'", end=" ")
-            print(f"to '{to_node_input.node.name}.{to_node_input.name}'.")
+            self._new_link(from_node_output, to_node_input)
+            _log.debug("Link created from %s.%s to %s.%s.",
+                from_node_output.node.name, from_node_output.name, to_node_input.node.name, to_node_input.name)
         else:
             print(f"[ERROR] Could not create link. Sockets not found ('{from_node_output.name}' or '{to_node_input.name}').")
 
@@ -113,7 +295,7 @@ class ShaderGenerator:
         
         if from_socket and to_socket:
             self.node_tree.links.new(from_socket, to_socket)
-            print(f"[INFO] Link created from '{from_node.name}.{from_socket_name}' to '{to_node.name}.{to_socket_name}'.")
+            _log.debug("Link created from %s.%s to %s.%s.", from_node.name, from_socket_name, to_node.name, to_socket_name)
         else:
             print(f"[ERROR] Could not create link. Sockets not found ('{from_socket_name}' or '{to_socket_name}').")
         """
@@ -130,8 +312,8 @@ class ShaderGenerator:
         to_socket = to_node.inputs.get(to_socket_name)
         
         if from_socket and to_socket:
-            self.node_tree.links.new(from_socket, to_socket)
-            print(f"[INFO] Link created from '{from_node.name}.{from_socket_name}' to '{to_node.name}.{to_socket_name}'.")
+            self._new_link(from_socket, to_socket)
+            _log.debug("Link created from %s.%s to %s.%s.", from_node.name, from_socket_name, to_node.name, to_socket_name)
         else:
             print(f"[ERROR] Could not create link. Sockets not found ('{from_socket_name}' or '{to_socket_name}').")
 
@@ -143,8 +325,8 @@ class ShaderGenerator:
             print("[ERROR] Node tree not set. Create a material first.")
             return
 
-        from_node = self.node_tree.nodes.get(from_node_name)
-        to_node = self.node_tree.nodes.get(to_node_name)
+        from_node = self._lookup_node(from_node_name)
+        to_node = self._lookup_node(to_node_name)
 
         if not from_node:
             print(f"[ERROR] 'From' node '{from_node_name}' not found.")
@@ -158,15 +340,134 @@ class ShaderGenerator:
             print(f"[ERROR] Socket '{to_socket_name}' not found on node '{to_node_name}'.")
             return
 
-        for link in to_socket.links:
-            print(f"[INFO] Removed old link from '{link.from_node.name}.{link.from_socket.name}' to '{to_node.name}.{to_socket.name}'.")
+        if self._incoming is None:
+            self._rebuild_link_index()
+        for link in self._incoming.pop(to_socket.as_pointer(), []):
+            _log.debug("Removed old link from %s.%s to %s.%s.",
+                link.from_node.name, link.from_socket.name, to_node.name, to_socket.name)
             self.node_tree.links.remove(link)
 
+        if self._pending_links:
+            self._pending_links[:] = [
+                (from_socket, queued_to) for from_socket, queued_to in self._pending_links
+                if queued_to != to_socket
+            ]
+
         self.create_link(from_node, from_socket_name, to_node, to_socket_name)
 
 
+    def prune_disconnected(self):
+        """
+        Removes every node that does not feed the material output, directly or
+        through other nodes. Cycles would drop them at compile time anyway; doing
+        it here also keeps them out of later node lookups.
+
+        Returns:
+            int: The number of nodes removed.
+        """
+        if not self.node_tree:
+            print("[ERROR] Node tree not set. Create a material first.")
+            return 0
+
+        output_nodes = [node for node in self.node_tree.nodes if node.bl_idname == 'ShaderNodeOutputMaterial']
+        if not output_nodes:
+            print("[ERROR] No material output node found; nothing pruned.")
+            return 0
+
+        reachable = set()
+        stack = list(output_nodes)
+        while stack:
+            node = stack.pop()
+            if node.name in reachable:
+                continue
+            reachable.add(node.name)
+            for node_input in node.inputs:
+                for link in node_input.links:
+                    stack.append(link.from_node)
+
+        dead_nodes = [node for node in self.node_tree.nodes if node.name not in reachable]
+        if not dead_nodes:
+            return 0
+
+        # Drop cached references before the nodes are freed.
+        self._nodes = {name: node for name, node in self._nodes.items() if node.name in reachable}
+        self._intern = {key: node for key, node in self._intern.items() if node.name in reachable}
+        self._incoming = None
+        for node in dead_nodes:
+            _log.debug("Pruned disconnected node %s.", node.name)
+            self.node_tree.nodes.remove(node)
+        return len(dead_nodes)
+
+    def plan_graph(self, edges):
+        """
+        Creates the links of a whole graph at once, skipping any that would not
+        survive in the final graph.
+
+        A later edge into the same input socket replaces an earlier one, as
+        set_link_attribute() would. Edges whose destination node cannot reach a
+        material output are then dropped, the same dead branches Cycles strips
+        at compile time, so they are never created.
+
+        Args:
+            edges (list): (from_node_name, from_socket_name, to_node_name, to_socket_name) tuples.
+
+        Returns:
+            list: The edges that were actually linked.
+        """
+        if not self.node_tree:
+            print("[ERROR] Node tree not set. Create a material first.")
+            return []
+
+        final_edges = {}
+        for from_node_name, from_socket_name, to_node_name, to_socket_name in edges:
+            final_edges[(to_node_name, to_socket_name)] = (from_node_name, from_socket_name)
+
+        upstream = {}
+        for (to_node_name, _), (from_node_name, _) in final_edges.items():
+            upstream.setdefault(to_node_name, set()).add(from_node_name)
+
+        reachable = set()
+        for to_node_name, _ in final_edges:
+            to_node = self._lookup_node(to_node_name)
+            if to_node and to_node.bl_idname == 'ShaderNodeOutputMaterial':
+                reachable.add(to_node_name)
+        stack = list(reachable)
+        while stack:
+            for from_node_name in upstream.get(stack.pop(), ()):
+                if from_node_name not in reachable:
+                    reachable.add(from_node_name)
+                    stack.append(from_node_name)
+
+        linked_edges = []
+        with self.batch():
+            for (to_node_name, to_socket_name), (from_node_name, from_socket_name) in final_edges.items():
+                if to_node_name not in reachable:
+                    _log.debug("Skipped dead link %s.%s -> %s.%s.", from_node_name, from_socket_name, to_node_name, to_socket_name)
+                    continue
+                from_node = self._lookup_node(from_node_name)
+                to_node = self._lookup_node(to_node_name)
+                if not from_node or not to_node:
+                    print(f"[ERROR] Node '{from_node_name}' or '{to_node_name}' not found.")
+                    continue
+                self.create_link(from_node, from_socket_name, to_node, to_socket_name)
+                linked_edges.append((from_node_name, from_socket_name, to_node_name, to_socket_name))
+        return linked_edges
+
+    def _lookup_node(self, node_name):
+        """
+        Returns a node by name, preferring the cache filled by create_node() and
+        falling back to the node tree for nodes created elsewhere. A node found in
+        the tree is cached too, so only the first lookup scans the tree.
+        """
+        node_obj = self._nodes.get(node_name)
+        if node_obj is None:
+            node_obj = self.node_tree.nodes.get(node_name)
+            if node_obj is not None:
+                self._nodes[node_name] = node_obj
+        return node_obj
+
     def get_node_by_name(self, node_name:str):
-        node_obj = self.node_tree.nodes.get(node_name)
+        node_obj = self._lookup_node(node_name)
         return node_obj
 
     def get_link_by_name(self, link_name:str):
@@ -179,40 +480,42 @@ def run_demo():
     A static method to demonstrate the functionality of the TextureGenerator class.
     """
     print("[INFO] --- Running TextureGenerator Demo ---")
-    bpy.ops.object.select_all(action='DESELECT')
-    
     cube_obj = bpy.data.objects.get("MultiShaderCube")
     if cube_obj:
         bpy.data.objects.remove(cube_obj, do_unlink=True)
     
-    bpy.ops.mesh.primitive_cube_add(size=2, enter_editmode=False, align='WORLD', location=(0, 0, 0))
-    bpy.context.object.name = "MultiShaderCube"
-    active_obj = bpy.context.object
-
-    generator = ShaderGenerator(active_obj)
+    cube_mesh = bpy.data.meshes.new("MultiShaderCube")
+    bm = bmesh.new()
+    bmesh.ops.create_cube(bm, size=2)
+    bm.to_mesh(cube_mesh)
+    bm.free()
+    active_obj = bpy.data.objects.new("MultiShaderCube", cube_mesh)
+    bpy.context.collection.objects.link(active_obj)
+
+    generator = ShaderGenerator()
+    generator.set_object(active_obj)
     generator.create_material("MixedShaderMaterial")
     
-    output_node = generator.create_node('ShaderNodeOutputMaterial', "My_Output_Node", location=(400, 0))
-    principled_node = generator.create_node('ShaderNodeBsdfPrincipled', "My_Principled_Node", location=(-200, 200))
-    emission_node = generator.create_node('ShaderNodeEmission', "My_Emission_Node", 
-        attributes={'Strength': 5.0}, location=(-200, -200))
-    mix_shader_node = generator.create_node('ShaderNodeMixShader', "My_Mix_Shader",
-        attributes={'Factor': 0.5}, location=(100, 0))
-        
-    generator.create_link(principled_node, 'BSDF', mix_shader_node, 'Shader_1')
-    generator.create_link(emission_node, 'Emission', mix_shader_node, 'Shader_2')
-    generator.create_link(mix_shader_node, 'Shader', output_node, 'Surface')
-    
-    generator.set_node_attribute("My_Principled_Node", {'Base Color': (1.0, 0.0, 0.0, 1.0)})
-    generator.set_node_attribute("My_Emission_Node", {'Color': (0.0, 0.0, 1.0, 1.0)})
-    
+    with generator.batch():
+        generator.create_node('ShaderNodeOutputMaterial', "My_Output_Node", location=(400, 0))
+        generator.create_node('ShaderNodeBsdfPrincipled', "My_Principled_Node", location=(-200, 200))
+        generator.create_node('ShaderNodeEmission', "My_Emission_Node", 
+            attributes={'Strength': 5.0}, location=(-200, -200))
+        generator.create_node('ShaderNodeMixShader', "My_Mix_Shader",
+            attributes={'Factor': 0.5}, location=(100, 0))
+            
+        generator.set_node_attribute("My_Principled_Node", {'Base Color': (1.0, 0.0, 0.0, 1.0)})
+        generator.set_node_attribute("My_Emission_Node", {'Color': (0.0, 0.0, 1.0, 1.0)})
+
+    # The last edge rewires the output to use the Principled BSDF directly, so the
+    # mix shader branch is dead and plan_graph() never links it.
     print("\n[INFO] --- Rewiring link to use Principled BSDF directly ---")
-    generator.set_link_attribute(
-        from_node_name="My_Principled_Node", 
-        from_socket_name="BSDF",
-        to_node_name="My_Output_Node", 
-        to_socket_name="Surface"
-    )
+    generator.plan_graph([
+        ("My_Principled_Node", 'BSDF', "My_Mix_Shader", 'Shader_1'),
+        ("My_Emission_Node", 'Emission', "My_Mix_Shader", 'Shader_2'),
+        ("My_Mix_Shader", 'Shader', "My_Output_Node", 'Surface'),
+        ("My_Principled_Node", 'BSDF', "My_Output_Node", 'Surface'),
+    ])
 
     # --- Verification Step ---
     print("\n[INFO] --- Verifying links after rewiring ---")
@@ -231,5 +534,9 @@ def run_demo():
     else:
         print("[ERROR] Could not find 'My_Emission_Node' for verification.")
 
+    # The emission and mix shader nodes no longer feed the output; drop them.
+    pruned_count = generator.prune_disconnected()
+    print(f"[INFO] Pruned {pruned_count} disconnected node(s).")
+
     print("[INFO] --- Demo Finished ---")
 
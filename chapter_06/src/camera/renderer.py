@@ -2,8 +2,14 @@ import bpy
 import os
 import sys
 import json
+import tempfile
+import subprocess
 from pathlib import Path
 
+# Relative output paths are resolved against the directory Blender was started
+# from; looked up once rather than on every set_output_settings() call.
+_CWD = Path.cwd()
+
 class Renderer:
     def __init__(self):
         self.logger = None
@@ -71,6 +77,16 @@ class Renderer:
         if engine == 'CYCLES':
             self.scene.cycles.samples = samples
             self.scene.cycles.use_denoising = True
+            # Keep BVH and shader data between frames of an animation, and let
+            # converged pixels stop sampling early.
+            self.scene.render.use_persistent_data = True
+            self.scene.cycles.use_adaptive_sampling = True
+            self.scene.cycles.adaptive_threshold = 0.01
+            if bpy.app.version < (3, 0, 0):
+                # Before Cycles X, the tile size set the per-tile launch overhead.
+                tile_size = 256 if self.scene.cycles.device == 'GPU' else 32
+                self.scene.render.tile_x = tile_size
+                self.scene.render.tile_y = tile_size
         elif engine == 'BLENDER_EEVEE':
             # Eevee specific settings can be added here if needed
             pass
@@ -92,7 +108,7 @@ class Renderer:
     def set_output_settings(self, output_path="render_output", 
                             file_format="PNG", 
                             video_codec="", container="",
-                            fps = 30
+                            fps = 30, png_compression=0
                             ):
         """
         Configures the output path, file format, and codec.
@@ -102,18 +118,15 @@ class Renderer:
             file_format (str): The file format ('FFMPEG', 'PNG', 'JPEG', etc.).
             video_codec (str): The video codec ('MPEG4', 'H264', etc.).
             container (str): The video container ('MPEG4', 'AVI', 'QUICKTIME', 'DV', 'OGG', 'MKV', 'FLASH', 'WEBM').
+            png_compression (int): PNG zlib compression, 0-100. Defaults to 0 since the
+                frames are usually re-encoded afterwards, so compressing them only costs time.
         """
         # Ensure the output directory exists
-        if output_path.startswith("./"):
-            output_path = output_path[2:]
-        
-        if not output_path.startswith("/"):
-            output_path = f"{os.getcwd()}/{output_path}"
-        if output_path.endswith("/"):
-            output_path = output_path[:-1]
-
-        if output_path and not os.path.exists(output_path):
-            os.makedirs(output_path)
+        output_dir = Path(output_path)
+        if not output_dir.is_absolute():
+            output_dir = _CWD / output_dir
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_path = str(output_dir)
             
         self.scene.render.fps = fps
         self.scene.render.fps_base = 1.0
@@ -131,6 +144,12 @@ class Renderer:
             "self.scene.render.fps_base": self.scene.render.fps_base       
         }
         
+        if file_format == 'PNG':
+            self.scene.render.image_settings.compression = png_compression
+            self.scene.render.image_settings.color_depth = '8'
+
+            output_setting["self.scene.render.image_settings.compression"] = self.scene.render.image_settings.compression
+
         if file_format == 'FFMPEG':
             self.scene.render.ffmpeg.codec = video_codec
             self.scene.render.ffmpeg.format = container
@@ -161,6 +180,78 @@ class Renderer:
             self.logger.error(f"_operate_rendering() threw an exception: '{str(e)}'")     
 
 
+    def render_animation_parallel(self, workers=None):
+        """
+        Renders the animation by splitting the frame range into contiguous chunks,
+        each rendered by a background Blender process. Frames are independent, so
+        the wall time drops roughly with the number of workers on CPU renders.
+
+        Args:
+            workers (int): Number of Blender processes. Defaults to the CPU count, capped at 4.
+        """
+        if not self.scene.camera:
+            self.logger.error("No active camera found in the scene. Cannot render.")
+            return
+
+        cpu_count = os.cpu_count() or 1
+        workers = workers or min(4, cpu_count)
+        frame_start, frame_end = self.scene.frame_start, self.scene.frame_end
+        workers = max(1, min(workers, frame_end - frame_start + 1))
+
+        # A single GPU cannot be shared between processes without slowing each down,
+        # and movie formats must be written by one process to end up in one file.
+        uses_gpu = self.scene.render.engine == 'CYCLES' and self.scene.cycles.device == 'GPU'
+        if workers == 1 or uses_gpu or self.scene.render.is_movie_format:
+            self.logger.info("render_animation_parallel(): Rendering in this process.")
+            self._operate_rendering()
+            return
+
+        # The workers load the scene from disk, so save a copy of the current state
+        # to a file of this run's own, which is removed once every worker has finished.
+        blend_fd, blend_path = tempfile.mkstemp(suffix=".blend")
+        os.close(blend_fd)
+        workers_info = []
+        try:
+            bpy.ops.wm.save_as_mainfile(filepath=blend_path, copy=True)
+
+            frame_count = frame_end - frame_start + 1
+            threads_per_worker = max(1, cpu_count // workers)
+            for worker_index in range(workers):
+                chunk_start = frame_start + frame_count * worker_index // workers
+                chunk_end = frame_start + frame_count * (worker_index + 1) // workers - 1
+                command = [
+                    bpy.app.binary_path, "--background", blend_path,
+                    "--threads", str(threads_per_worker),
+                    "--frame-start", str(chunk_start), "--frame-end", str(chunk_end),
+                    "--render-anim"
+                ]
+                self.logger.info(f"render_animation_parallel(): Worker {worker_index} renders frames {chunk_start}-{chunk_end}.")
+                # stderr goes to a file rather than a pipe, so a chatty worker never blocks on it
+                stderr_file = tempfile.TemporaryFile()
+                process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=stderr_file)
+                workers_info.append((worker_index, chunk_start, chunk_end, process, stderr_file))
+
+            failed_count = 0
+            for worker_index, chunk_start, chunk_end, process, stderr_file in workers_info:
+                return_code = process.wait()
+                if return_code != 0:
+                    failed_count += 1
+                    stderr_file.seek(0)
+                    stderr_text = stderr_file.read().decode(errors="replace").strip()
+                    self.logger.error(f"render_animation_parallel(): Worker {worker_index} (frames {chunk_start}-{chunk_end}) "
+                                      f"exited with code {return_code}. stderr:\n{stderr_text}")
+
+            if failed_count:
+                self.logger.error(f"render_animation_parallel(): {failed_count} worker(s) failed.")
+            else:
+                self.logger.info("Rendering process completed.")
+        finally:
+            for _, _, _, process, stderr_file in workers_info:
+                process.wait()
+                stderr_file.close()
+            os.remove(blend_path)
+
+
     def render_frame_images(self, output_path="frame_images"):
         # Rendering images for all frames.
         self.logger.info("render_frame_images(): Starting renderring frames to image series...")
@@ -172,6 +263,21 @@ class Renderer:
         self._operate_rendering() 
 
 
+    def render_video(self, output_path="render_output", codec="H264", container="MPEG4"):
+        """
+        Renders the animation straight to a video file in one pass, without
+        writing and re-importing an intermediate image sequence.
+        """
+        self.logger.info("render_video(): Starting renderring frames directly to video...")
+        self.set_output_settings(
+            output_path=output_path,
+            file_format="FFMPEG", video_codec=codec, container=container
+        )
+
+        self._operate_rendering()
+        self.logger.info(f" Successfully generated a video stored in directory '{output_path}'")
+
+
     def _import_image_sequence(self, input_images_dir="frame_images", image_extension="png", frame_duration=1):
         """
         Import image sequence into video sequencer
@@ -185,24 +291,31 @@ class Renderer:
 
         # Get sorted list of image files
         images_path = Path(input_images_dir).resolve()
-        image_files = sorted(images_path.glob(f"*.{image_extension}"))
+        suffix = f".{image_extension}"
+        with os.scandir(images_path) as entries:
+            image_names = sorted(entry.name for entry in entries if entry.is_file() and entry.name.endswith(suffix))
+        image_files = [images_path / image_name for image_name in image_names]
   
-        # Add each image to sequencer
-        current_frame = self.scene.frame_start       
-        for img_path in image_files:
-            # Create image strip
-            strip = self.sequencer.sequences.new_image(
-                name=img_path.stem,
-                filepath=str(img_path),
-                channel=1,
-                frame_start=current_frame
-            )
-            
-            # Set strip duration
-            strip.frame_final_duration = frame_duration
-            
-            # Move to next frame position
-            current_frame += frame_duration
+        if not image_files:
+            self.logger.error(f"_import_image_sequence(): No '*.{image_extension}' images found in '{images_path}'.")
+            return
+
+        # Add all images as one image-sequence strip. Each image is listed
+        # frame_duration times so it stays on screen for that many frames.
+        element_names = [img_path.name for img_path in image_files for _ in range(frame_duration)]
+        current_frame = self.scene.frame_start
+        strip = self.sequencer.sequences.new_image(
+            name="frames",
+            filepath=str(image_files[0]),
+            channel=1,
+            frame_start=current_frame
+        )
+        for element_name in element_names[1:]:
+            strip.elements.append(element_name)
+
+        # Set strip duration
+        strip.frame_final_duration = len(element_names)
+        current_frame += len(element_names)
 
         # Set scene frame range to match sequence length
         self.scene.frame_start = 1
@@ -230,19 +343,19 @@ class Renderer:
 
     @staticmethod
     def run_demo():
-        bpy.ops.object.camera_add(location=(10, -10, 5))
-        bpy.context.object.name = "Camera4Renderer"
-        bpy.context.scene.camera = bpy.context.object
+        camera_data = bpy.data.cameras.new("Camera4Renderer")
+        camera_obj = bpy.data.objects.new("Camera4Renderer", camera_data)
+        camera_obj.location = (10, -10, 5)
+        bpy.context.collection.objects.link(camera_obj)
+        bpy.context.scene.camera = camera_obj
     
         demo_rendering_engine = Renderer()
         demo_rendering_engine.set_scene_settings()
 
-        demo_rendering_engine.render_frame_images(
-            output_path="tmp_frame_img"
-            )
-        demo_rendering_engine.compile_images_to_video(
-            input_images_dir="tmp_frame_img",
-            output_video_dir="video_output/"
+        # Use render_frame_images() followed by compile_images_to_video() instead
+        # when the individual frame images are needed as well.
+        demo_rendering_engine.render_video(
+            output_path="video_output/"
             )
 
 